@@ -0,0 +1,54 @@
+"""
+Minting a batch of access tokens, with an add_scopes_to_payload handler
+that waits on I/O (simulated with a 1ms sleep), one generate_access_token
+call at a time against generate_access_tokens.
+"""
+
+import asyncio
+import sys
+import time
+
+from common import create_app, report
+
+USERS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+
+async def add_scopes_to_payload(user):
+    await asyncio.sleep(0.001)
+    return ["user"]
+
+
+async def single_calls(auth, users):
+    return [await auth.generate_access_token(user) for user in users]
+
+
+def run(label, fn, users):
+    start = time.perf_counter()
+    tokens = asyncio.run(fn(users))
+    assert len(tokens) == len(users)
+    report(label, (time.perf_counter() - start) / len(users))
+
+
+def main():
+    sanicjwt = create_app(
+        scopes_enabled=True,
+        add_scopes_to_payload=add_scopes_to_payload,
+        claim_iat=True,
+    )
+    auth = sanicjwt.instance.ctx.auth
+    users = [{"user_id": i} for i in range(USERS)]
+
+    run(
+        "loop of generate_access_token",
+        lambda users: single_calls(auth, users),
+        users,
+    )
+    run(
+        "generate_access_tokens",
+        lambda users: auth.generate_access_tokens(users),
+        users,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Regression benchmark for token generation on a long running worker. It
+generates a large number of tokens (1,000,000 by default) and asserts that
+neither the cost per token nor the memory in use grows along the way.
+
+    python benchmarks/bench_claims_growth.py [number]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+
+from common import create_app, report
+
+NUMBER = 1000000
+WINDOW = 10000
+SAMPLES = 5
+MAX_SLOWDOWN = 1.5
+MAX_MEMORY_GROWTH = 1024 * 1024
+
+
+async def generate(auth, number):
+    user = {"user_id": 1}
+    timings = []
+    memory = []
+
+    start = time.perf_counter()
+    for i in range(1, number + 1):
+        await auth.generate_access_token(user)
+
+        if i % WINDOW == 0:
+            now = time.perf_counter()
+            timings.append((now - start) / WINDOW)
+            memory.append(tracemalloc.get_traced_memory()[0])
+            start = now
+
+    return timings, memory
+
+
+def main(number):
+    sanicjwt = create_app(claim_iat=True, claim_iss="issuer")
+    auth = sanicjwt.instance.ctx.auth
+    claims = auth.claims
+
+    tracemalloc.start()
+    timings, memory = asyncio.run(generate(auth, number))
+    tracemalloc.stop()
+
+    first = statistics.median(timings[:SAMPLES])
+    last = statistics.median(timings[-SAMPLES:])
+    growth = memory[-1] - memory[min(SAMPLES, len(memory)) - 1]
+
+    report("generate_access_token, first windows", first)
+    report("generate_access_token, last windows", last)
+    print("{:<48} {:>10d} B".format("memory growth", growth))
+
+    assert auth.claims == claims
+    assert last < first * MAX_SLOWDOWN
+    assert growth < MAX_MEMORY_GROWTH
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else NUMBER)
@@ -0,0 +1,43 @@
+"""
+Cost of reading a setting, e.g. config.leeway(), inside a running loop. A
+static setting returns its value without looking at the loop or the current
+task. A dynamic one (with a get_<setting>() method, or overridden for the
+request by a decorator) goes through the per request cache.
+"""
+
+from common import measure, report
+
+from sanic_jwt import Configuration
+from sanic_jwt.cache import clear_cache, to_cache
+
+NUMBER = 200000
+
+
+class BenchmarkConfiguration(Configuration):
+    def get_leeway(self, request=None):
+        return 10
+
+
+def main():
+    config = BenchmarkConfiguration({})
+
+    report("static setting", measure(config.user_id, NUMBER))
+
+    def dynamic():
+        config.leeway()
+        clear_cache()
+
+    report("dynamic setting, get_leeway()", measure(dynamic, NUMBER))
+
+    def overridden():
+        config._push_instant_overrides(["user_id"])
+        to_cache("user_id", "id")
+        config.user_id()
+        config._pop_instant_overrides(["user_id"])
+        clear_cache()
+
+    report("setting overridden by a decorator", measure(overridden, NUMBER))
+
+
+if __name__ == "__main__":
+    main()
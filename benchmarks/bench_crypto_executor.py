@@ -0,0 +1,57 @@
+"""
+How long the event loop is blocked while a burst of RS256 access tokens is
+signed, with the signing done inline and in the crypto_executor pools. A
+heartbeat task wakes up every millisecond; its worst delay is how long any
+other request handled by the worker would have been stalled.
+"""
+
+import asyncio
+import time
+
+from bench_rs256 import generate_keys
+from common import create_app
+
+TOKENS = 200
+
+
+async def burst(auth):
+    delays = []
+    done = False
+
+    async def heartbeat():
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            delays.append(time.perf_counter() - start - 0.001)
+
+    task = asyncio.ensure_future(heartbeat())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await auth.generate_access_tokens({"user_id": i} for i in range(TOKENS))
+    elapsed = time.perf_counter() - start
+    done = True
+    await task
+    auth._crypto.shutdown()
+    return elapsed, max(delays)
+
+
+def main():
+    private_pem, public_pem = generate_keys()
+    for mode in ("none", "thread", "process"):
+        sanicjwt = create_app(
+            algorithm="RS256",
+            secret=public_pem,
+            private_key=private_pem,
+            crypto_executor=mode,
+        )
+        elapsed, stall = asyncio.run(burst(sanicjwt.instance.ctx.auth))
+        print(
+            "{:<10} {:>8.1f} ms for {} tokens, "
+            "loop blocked up to {:>8.2f} ms".format(
+                mode, elapsed * 1e3, TOKENS, stall * 1e3
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
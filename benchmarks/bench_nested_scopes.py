@@ -0,0 +1,43 @@
+"""
+A token carrying 200 scopes, going through three nested @scoped checks on
+the same request.
+"""
+
+import asyncio
+
+from common import create_app, create_request, measure, report
+
+from sanic_jwt import scoped
+
+NUMBER = 2000
+SCOPES = ["resource{}:read:write".format(i) for i in range(199)] + ["user"]
+
+
+def main():
+    sanicjwt = create_app(
+        scopes_enabled=True,
+        add_scopes_to_payload=lambda user: SCOPES,
+    )
+    auth = sanicjwt.instance.ctx.auth
+    token = asyncio.run(auth.generate_access_token({"user_id": 1}))
+
+    async def handler(request):
+        return True
+
+    decorated = scoped("resource3:read")(handler)
+    report(
+        "1 @scoped check, 200 scopes",
+        measure(lambda: decorated(create_request(sanicjwt, token)), NUMBER),
+    )
+
+    decorated = scoped(["resource198:write", "user"])(
+        scoped("resource100:read:write")(scoped("resource3:read")(handler))
+    )
+    report(
+        "3 nested @scoped checks, 200 scopes",
+        measure(lambda: decorated(create_request(sanicjwt, token)), NUMBER),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+RS256 verification and signing, with the PEM encoded keys parsed on every
+call (as PyJWT does when it is given a string) and with the preloaded key
+objects that Sanic JWT now passes to it.
+"""
+
+import asyncio
+
+import jwt
+from common import create_app, measure, report
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+NUMBER = 2000
+
+
+def generate_keys():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        key.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    return private_pem, public_pem
+
+
+def main():
+    private_pem, public_pem = generate_keys()
+    sanicjwt = create_app(
+        algorithm="RS256", secret=public_pem, private_key=private_pem
+    )
+    auth = sanicjwt.instance.ctx.auth
+    token = asyncio.run(auth.generate_access_token({"user_id": 1}))
+    payload = jwt.decode(token, public_pem, algorithms=["RS256"])
+
+    report(
+        "verify, PEM parsed per call",
+        measure(
+            lambda: jwt.decode(token, public_pem, algorithms=["RS256"]),
+            NUMBER,
+        ),
+    )
+    report(
+        "verify, Authentication._decode",
+        measure(lambda: auth._decode(token), NUMBER),
+    )
+
+    report(
+        "sign, PEM parsed per call",
+        measure(
+            lambda: jwt.encode(payload, private_pem, algorithm="RS256"),
+            NUMBER // 10,
+        ),
+    )
+    report(
+        "sign, Authentication.generate_access_token",
+        measure(
+            lambda: auth.generate_access_token({"user_id": 1}), NUMBER // 10
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
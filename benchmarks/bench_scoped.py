@@ -0,0 +1,50 @@
+"""
+Per request overhead of the @scoped decorator, with route kwargs carrying a
+large parsed object.
+"""
+
+import asyncio
+
+from common import create_app, create_request, measure, report
+
+from sanic_jwt import scoped
+
+NUMBER = 5000
+
+
+def main():
+    sanicjwt = create_app(
+        scopes_enabled=True,
+        add_scopes_to_payload=lambda user: ["user:read", "user:write"],
+    )
+    auth = sanicjwt.instance.ctx.auth
+    token = asyncio.run(auth.generate_access_token({"user_id": 1}))
+    document = {str(i): {"items": list(range(20))} for i in range(100)}
+
+    async def handler(request, document):
+        return document
+
+    report(
+        "handler without decorator",
+        measure(
+            lambda: handler(
+                create_request(sanicjwt, token), document=document
+            ),
+            NUMBER,
+        ),
+    )
+
+    decorated = scoped("user:read")(handler)
+    report(
+        "@scoped('user:read')",
+        measure(
+            lambda: decorated(
+                create_request(sanicjwt, token), document=document
+            ),
+            NUMBER,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
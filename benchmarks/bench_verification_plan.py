@@ -0,0 +1,36 @@
+"""
+Per request overhead of building the arguments passed to jwt.decode, compared
+with reusing the verification plan compiled at initialization.
+"""
+
+import asyncio
+
+from common import create_app, measure, report
+
+NUMBER = 20000
+
+
+def main():
+    sanicjwt = create_app(claim_iss="issuer", claim_aud="audience")
+    auth = sanicjwt.instance.ctx.auth
+    token = asyncio.run(auth.generate_access_token({"user_id": 1}))
+
+    report(
+        "compile plan on every call (before)",
+        measure(auth._compile_verification_plan, NUMBER),
+    )
+    report(
+        "reuse compiled plan (after)",
+        measure(auth._get_verification_plan, NUMBER),
+    )
+
+    after = measure(lambda: auth._decode(token), NUMBER)
+    auth._get_verification_plan = auth._compile_verification_plan
+    before = measure(lambda: auth._decode(token), NUMBER)
+
+    report("_decode, compile plan on every call (before)", before)
+    report("_decode, reuse compiled plan (after)", after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Helpers shared by the benchmark scripts. Each benchmark is a standalone
+script that can be run from the root of the repository, once sanic-jwt
+and its test requirements are installed:
+
+    python benchmarks/bench_verification_plan.py
+"""
+
+import asyncio
+import inspect
+import itertools
+import time
+from types import SimpleNamespace
+
+from sanic import Sanic
+
+from sanic_jwt import Initialize
+
+SECRET = "a benchmark secret that is long enough for HS512"
+
+_names = itertools.count()
+
+
+def create_app(**kwargs):
+    """
+    Initialize Sanic JWT on a fresh app, and return its Initialize instance
+    """
+    kwargs.setdefault("authenticate", lambda request: {"user_id": 1})
+    kwargs.setdefault("secret", SECRET)
+    app = Sanic("sanic-jwt-benchmark-{}".format(next(_names)))
+    return Initialize(app, **kwargs)
+
+
+def measure(fn, number):
+    """
+    Call fn() number times inside a running loop, awaiting the result if
+    needed, and return the seconds spent per call
+    """
+
+    async def runner():
+        start = time.perf_counter()
+        for _ in range(number):
+            result = fn()
+            if inspect.isawaitable(result):
+                await result
+        return (time.perf_counter() - start) / number
+
+    return asyncio.run(runner())
+
+
+def report(label, seconds):
+    print("{:<48} {:>10.2f} us".format(label, seconds * 1e6))
+
+
+def create_request(sanicjwt, access_token, method="GET"):
+    """
+    A minimal stand-in for a sanic.Request carrying an access token, so that
+    decorated handlers can be called without going through a server
+    """
+    return SimpleNamespace(
+        app=sanicjwt.app,
+        method=method,
+        headers={"authorization": "Bearer {}".format(access_token)},
+        cookies={},
+        args={},
+        ctx=SimpleNamespace(),
+    )
@@ -10,7 +10,9 @@ from .configuration import Configuration
 from .decorators import inject_user, protected, scoped
 from .endpoints import BaseEndpoint
 from .initialization import Initialize, initialize
+from .keyring import KeyRing
 from .responses import Responses
+from .revocation import RevocationList
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
@@ -23,7 +25,9 @@ __all__ = [
     "initialize",
     "Initialize",
     "inject_user",
+    "KeyRing",
     "protected",
     "Responses",
+    "RevocationList",
     "scoped",
 ]
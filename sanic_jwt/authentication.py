@@ -1,30 +1,286 @@
+import asyncio
 import inspect
 import logging
+import time
+from collections import namedtuple
 from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta
 
 import jwt
 
-from . import exceptions, utils
+from . import crypto, exceptions, utils
+from .cache import TTLCache
+from .claim import compile_verifier
 from .exceptions import (
     InvalidCustomClaimError,
     InvalidVerification,
     InvalidVerificationError,
     SanicJWTException,
+    TokenRevoked,
 )
 
 logger = logging.getLogger(__name__)
-claim_label = {"iss": "issuer", "iat": "iat", "nbf": "nbf", "aud": "audience"}
+verification_errors = (
+    jwt.exceptions.ExpiredSignatureError,
+    jwt.exceptions.InvalidIssuerError,
+    jwt.exceptions.ImmatureSignatureError,
+    jwt.exceptions.InvalidIssuedAtError,
+    jwt.exceptions.InvalidAudienceError,
+    jwt.exceptions.DecodeError,
+    InvalidVerificationError,
+    InvalidCustomClaimError,
+    TokenRevoked,
+)
+# A batch reports every token that cannot be verified on its own, instead
+# of failing as a whole
+batch_verification_errors = verification_errors + (
+    jwt.exceptions.InvalidTokenError,
+)
+_missing = object()
+_claims_template = ContextVar("sanicjwt_claims_template", default=None)
+registered_claims = ("iss", "iat", "nbf", "aud", "jti")
+claim_settings = tuple("claim_{}".format(x) for x in registered_claims)
+verification_settings = (
+    "algorithm",
+    "claim_aud",
+    "claim_iss",
+    "leeway",
+    "secret",
+    "user_secret_enabled",
+    "verify_exp",
+)
+
+token_lookup_settings = (
+    "authorization_header",
+    "authorization_header_prefix",
+    "cookie_access_token_name",
+    "cookie_refresh_token_name",
+    "cookie_set",
+    "cookie_split",
+    "cookie_split_signature_name",
+    "cookie_strict",
+    "query_string_access_token_name",
+    "query_string_refresh_token_name",
+    "query_string_set",
+    "query_string_strict",
+    "refresh_token_name",
+)
+
+_Hooks = namedtuple(
+    "_Hooks",
+    [
+        "add_claims",
+        "add_scopes_to_payload",
+        "authenticate",
+        "build_payload",
+        "extend_payload",
+        "retrieve_refresh_token",
+        "retrieve_user",
+        "retrieve_user_secret",
+        "retrieve_users",
+        "store_refresh_token",
+    ],
+)
+hook_names = frozenset(_Hooks._fields)
+_VerificationPlan = namedtuple(
+    "_VerificationPlan",
+    ["algorithms", "options", "leeway", "audience", "issuer"],
+)
+TokenVerification = namedtuple(
+    "TokenVerification", ["valid", "payload", "reasons"]
+)
+_TokenLookup = namedtuple(
+    "_TokenLookup",
+    [
+        "cookie_set",
+        "cookie_strict",
+        "cookie_access_token_name",
+        "cookie_refresh_token_name",
+        "cookie_split_signature_name",
+        "query_string_set",
+        "query_string_strict",
+        "query_string_access_token_name",
+        "query_string_refresh_token_name",
+        "header",
+        "header_prefix",
+        "refresh_token_name",
+    ],
+)
+
+
+def _order_claims(claims, payload):
+    """
+    Groups the claims into levels, so that every claim comes after the
+    claims that it depends on. A dependency that is not one of the claims
+    must already be in the payload.
+    """
+    pending = {claim.get_key(): claim for claim in claims}
+    if not any(claim.depends_on for claim in pending.values()):
+        return [list(pending.values())]
+
+    levels = []
+    ready = set(x for x in payload if x not in pending)
+    while pending:
+        level = [
+            claim
+            for claim in pending.values()
+            if all(x in ready for x in claim.depends_on)
+        ]
+        if not level:
+            raise exceptions.InvalidCustomClaim(
+                "Custom claim dependencies cannot be met: {}".format(
+                    ", ".join(sorted(pending))
+                )
+            )
+
+        for claim in level:
+            ready.add(pending.pop(claim.get_key()).get_key())
+        levels.append(level)
+
+    return levels
+
+
+async def _setup_claim(claim, payload, user, timeout=None):
+    if claim.timeout is not None:
+        timeout = claim.timeout
+
+    if timeout is None:
+        return await claim._setup(payload, user)
+
+    try:
+        return await asyncio.wait_for(claim._setup(payload, user), timeout)
+    except asyncio.TimeoutError:
+        raise exceptions.CustomClaimTimeout(
+            "Custom claim setup timed out: {}".format(claim.get_key())
+        )
+
+
+class _UserLoader:
+    """
+    Coalesces the users that are retrieved during one iteration of the
+    event loop. Each user is retrieved once, no matter how many requests
+    are waiting for it, and with ``retrieve_users`` all of them are
+    retrieved with a single call.
+    """
+
+    __slots__ = ("auth", "loop", "pending", "batch")
+
+    def __init__(self, auth, loop):
+        self.auth = auth
+        self.loop = loop
+        self.pending = {}
+        self.batch = None
+
+    def load(self, request, payload, user_id):
+        future = self.pending.get(user_id)
+        if future is None:
+            future = self.loop.create_future()
+            self.pending[user_id] = future
+            if self.batch is None:
+                self.batch = {}
+                self.loop.call_soon(self._dispatch)
+            self.batch[user_id] = (request, payload)
+
+        # Shielded, so that a cancelled request does not cancel the lookup
+        # for every other request waiting on the same user
+        return asyncio.shield(future)
+
+    def _dispatch(self):
+        batch, self.batch = self.batch, None
+        self.loop.create_task(self._fetch(batch))
+
+    async def _fetch(self, batch):
+        try:
+            users = await self.auth._retrieve_users(batch)
+        except Exception as e:
+            users = {user_id: e for user_id in batch}
+        except BaseException:
+            for user_id in batch:
+                self.pending.pop(user_id).cancel()
+            raise
+
+        for user_id in batch:
+            future = self.pending.pop(user_id)
+            user = users.get(user_id)
+            if future.done():
+                continue
+            elif isinstance(user, asyncio.CancelledError):
+                future.cancel()
+            elif isinstance(user, BaseException):
+                future.set_exception(user)
+            else:
+                future.set_result(user)
 
 
 class BaseAuthentication:
     def __init__(self, app, config):
         self.app = app
-        self.claims = ["exp"]
+        self._claims = None
         self._extra_verifications = None
         self.config = config
         self._reasons = []
         self._custom_claims = set()
+        self._token_cache = None
+        self._user_cache = None
+        self._user_loader = None
+        self._user_secret_cache = None
+        self._user_secret_pending = {}
+        self._compiled = {}
+        self._crypto = crypto.CryptoExecutor(
+            config.crypto_executor(),
+            workers=config.crypto_executor_workers(),
+            max_pending=config.crypto_executor_max_pending(),
+        )
+
+        token_cache_size = config.token_cache_size()
+        if token_cache_size:
+            self._token_cache = TTLCache(
+                token_cache_size, config.token_cache_ttl()
+            )
+
+        user_cache_size = config.user_cache_size()
+        if user_cache_size:
+            self._user_cache = TTLCache(
+                user_cache_size, config.user_cache_ttl()
+            )
+
+        user_secret_cache_size = config.user_secret_cache_size()
+        if user_secret_cache_size:
+            self._user_secret_cache = TTLCache(
+                user_secret_cache_size, config.user_secret_cache_ttl()
+            )
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in hook_names:
+            # A handler was replaced, its adapter is built again on next use
+            self.__dict__.pop("_compiled_hooks", None)
+
+    @property
+    def _hooks(self):
+        """
+        The handlers (``retrieve_user``, ``extend_payload``, etc) wrapped
+        into coroutine functions, so that they can be awaited without
+        inspecting them on every call.
+        """
+        hooks = self.__dict__.get("_compiled_hooks")
+        if hooks is None:
+            hooks = self.__dict__["_compiled_hooks"] = self._compile_hooks()
+        return hooks
+
+    def _compile_hooks(self):
+        adapters = {x: utils.adapt(getattr(self, x)) for x in _Hooks._fields}
+
+        if "user" not in inspect.getfullargspec(self.extend_payload).args:
+            extend = adapters["extend_payload"]
+
+            async def extend_payload(payload, user):
+                return await extend(payload)
+
+            adapters["extend_payload"] = extend_payload
+
+        return _Hooks(**adapters)
 
     async def _get_user_id(self, user, *, asdict=False):
         """
@@ -56,44 +312,127 @@ class BaseAuthentication:
         Injects standard claims into the payload for: exp, iss, iat, nbf, aud.
         And, custom claims, if they exist
         """
-        delta = timedelta(seconds=self.config.expiration_delta())
-        exp = datetime.utcnow() + delta
-        additional = {"exp": exp}
-
-        for option in ["iss", "iat", "nbf", "aud"]:
-            setting = "claim_{}".format(option.lower())
-            if setting in self.config:  # noqa
-                attr = self.config.get(setting)
-                if attr:
-                    self.claims.append(option)
-                    method_name = "build_claim_{}".format(option)
-                    method = getattr(utils, method_name)
-                    additional.update({option: method(attr, self.config)})
-
-        payload.update(additional)
+        template = _claims_template.get()
+        if template is None:
+            payload.update(self._build_registered_claims())
+        else:
+            payload.update(template)
+            if "jti" in template:
+                # Every token of a batch still gets its own id
+                payload["jti"] = utils.build_claim_jti(True)
 
+        timeout = self.config.claim_setup_timeout()
         if self._custom_claims:
-            custom_claims = {}
-            for claim in self._custom_claims:
-                custom_claims[claim.get_key()] = await utils.call(
-                    claim.setup, payload, user
-                )
-            payload.update(custom_claims)
+            await self._setup_claims(
+                self._custom_claims, payload, user, timeout
+            )
 
         if inline_claims:
-            claims = {}
-            for claim in inline_claims:
-                instance = claim()
-                claims[instance.get_key()] = await utils.call(
-                    instance.setup, payload, user
-                )
-            payload.update(claims)
+            await self._setup_claims(
+                [claim._get_instance() for claim in inline_claims],
+                payload,
+                user,
+                timeout,
+            )
 
         return payload
 
+    async def _setup_claims(self, claims, payload, user, timeout=None):
+        """
+        Adds the values of the claims to the payload. Setups that do not
+        depend on each other run concurrently, and a claim that declares
+        ``depends_on`` is only set up once those claims are in the payload.
+        """
+        for level in _order_claims(claims, payload):
+            if len(level) == 1:
+                values = [await _setup_claim(level[0], payload, user, timeout)]
+            else:
+                tasks = [
+                    asyncio.ensure_future(
+                        _setup_claim(claim, payload, user, timeout)
+                    )
+                    for claim in level
+                ]
+                try:
+                    values = await asyncio.gather(*tasks)
+                except BaseException:
+                    for task in tasks:
+                        task.cancel()
+                    raise
+
+            payload.update(zip((claim.get_key() for claim in level), values))
+
+    def _build_registered_claims(self):
+        delta = timedelta(seconds=self.config.expiration_delta())
+        exp = datetime.utcnow() + delta
+        additional = {"exp": exp}
+
+        for option in self._get_registered_claims()[1:]:
+            attr = self.config.get("claim_{}".format(option))
+            method = getattr(utils, "build_claim_{}".format(option))
+            additional.update({option: method(attr, self.config)})
+
+        return additional
+
     async def extend_payload(self, payload, user=None, *args, **kwargs):
         return payload
 
+    @property
+    def claims(self):
+        """
+        The claims that every token is required to have. Unless they have
+        been assigned, they are the registered claims: ``exp``, followed by
+        any of iss, iat, nbf, aud and jti that are enabled.
+        """
+        if self._claims is not None:
+            return self._claims
+
+        return self._get_registered_claims()
+
+    @claims.setter
+    def claims(self, value):
+        self._claims = None if value is None else tuple(value)
+
+    def _get_registered_claims(self):
+        return self._get_compiled(
+            "claims", claim_settings, self._compile_claims
+        )
+
+    def _compile_claims(self):
+        return ("exp",) + tuple(
+            option
+            for option, setting in zip(registered_claims, claim_settings)
+            if self.config.get(setting)
+        )
+
+    def _get_compiled(self, name, settings, build):
+        """
+        Get a value derived from the configuration with ``build()``. It is
+        built once, and only rebuilt after the configuration has changed.
+        When any of the settings is resolved per request (with a
+        ``get_<setting>()`` method or by passing it to a decorator), the
+        value is built on every call instead.
+        """
+        config = self.config
+        if config._is_overridden(*settings):
+            # Never stored, or it would serve the other requests as well
+            return build()
+
+        revision, value = self._compiled.get(name, (None, None))
+
+        if revision != config._revision:
+            value = build()
+            if config._is_dynamic(*settings):
+                self._compiled[name] = (config._revision, None)
+                return value
+
+            self._compiled[name] = (config._revision, value)
+
+        if value is None:
+            return build()
+
+        return value
+
     async def store_refresh_token(self, *args, **kwargs):
         raise exceptions.RefreshTokenNotImplemented()  # noqa
 
@@ -126,6 +465,9 @@ class BaseAuthentication:
     async def retrieve_user(self, *args, **kwargs):
         raise exceptions.MeEndpointNotSetup  # noqa
 
+    async def retrieve_users(self, user_ids, *args, **kwargs):
+        raise exceptions.MeEndpointNotSetup  # noqa
+
 
 class Authentication(BaseAuthentication):
     async def _check_authentication(
@@ -156,55 +498,141 @@ class Authentication(BaseAuthentication):
 
         return is_valid, status, reasons
 
-    async def _decode(self, token, verify=True, inline_claims=None):
+    async def _decode(
+        self, token, verify=True, inline_claims=None, secret=None, plan=None
+    ):
         """
         Take a JWT and return a decoded payload. Optionally, will verify
-        the claims on the token.
+        the claims on the token. The ``secret`` and ``plan`` are looked up,
+        unless they are given.
         """
-        secret = await self._get_secret(token=token)
-        algorithm = self._get_algorithm()
-        kwargs = {}
-
-        for claim in self.claims:
-            if claim != "exp":
-                setting = "claim_{}".format(claim.lower())
-                if setting in self.config:  # noqa
-                    value = self.config.get(setting)
-                    kwargs.update({claim_label[claim]: value})
-
-        kwargs["leeway"] = int(self.config.leeway())
-        if "claim_aud" in self.config:  # noqa
-            kwargs["audience"] = self.config.claim_aud()
-        if "claim_iss" in self.config:  # noqa
-            kwargs["issuer"] = self.config.claim_iss()
-
-        decoded = jwt.decode(
-            token,
-            secret,
-            algorithms=[algorithm],
-            verify=verify,
-            options={"verify_exp": self.config.verify_exp()},
-            **kwargs,
-        )
+        if secret is None:
+            config = self.config
+            if config.key_ring() is None and not config.user_secret_enabled():
+                secret = await self._get_secret()
+            else:
+                # Parsed once, whether the key ring reads the header or the
+                # user secret is looked up from the payload
+                parsed = utils.ParsedToken(token)
+                secret = await self._get_secret(token=parsed)
+                token = parsed.token
+        if plan is None:
+            plan = self._get_verification_plan()
+        use_cache = verify and self._token_cache is not None
+        decoded = None
+
+        if use_cache:
+            params = (secret, plan)
+            decoded = self._get_cached_token(token, params)
+
+        if decoded is None:
+            decoded = await self._crypto.run(
+                crypto.decode, plan.algorithms[0], token, secret, plan
+            )
+
+            if use_cache:
+                self._cache_token(token, params, decoded)
+
+        self._check_revocation(decoded)
 
         if verify:
-            if self._extra_verifications:
-                self._verify_extras(decoded)
-            if self._custom_claims or inline_claims:
-                self._verify_custom_claims(
-                    decoded, inline_claims=inline_claims
-                )
+            self._verify_payload(decoded, inline_claims=inline_claims)
 
         return decoded
 
+    async def _decode_from_request(self, request, token, verify=True):
+        """
+        Decode the token sent with a request. The payload is kept on the
+        request as ``request.ctx.jwt_payload``, so that the signature of a
+        token is only checked once per request, no matter how many
+        decorators and helpers need the payload.
+        """
+        ctx = getattr(request, "ctx", None)
+        plan = self._get_verification_plan()
+        decoded = getattr(ctx, "_sanicjwt_decoded", None)
+
+        if (
+            decoded is not None
+            and decoded[0] is self
+            # A plan that depends on the request is built on every call
+            and decoded[1] == plan
+            and decoded[2] == token
+        ):
+            payload, verified = decoded[3], decoded[4]
+            self._check_revocation(payload)
+            if verify and not verified:
+                self._verify_payload(payload)
+                ctx._sanicjwt_decoded = (self, plan, token, payload, True)
+            return payload
+
+        payload = await self._decode(token, verify=verify, plan=plan)
+
+        if ctx is not None:
+            ctx.jwt_payload = payload
+            ctx._sanicjwt_decoded = (self, plan, token, payload, verify)
+
+        return payload
+
+    def _check_revocation(self, payload):
+        revocation_list = self.config.revocation_list()
+        if revocation_list is not None and revocation_list.is_revoked(
+            payload.get("jti")
+        ):
+            raise TokenRevoked()
+
+    def _get_cached_token(self, token, params):
+        """
+        Return a copy of a previously verified payload, as long as it was
+        verified with the same secret and decode options.
+        """
+        entry = self._token_cache.get(token)
+        if entry is not None and entry[0] == params:
+            return dict(entry[1])
+
+        return None
+
+    def _cache_token(self, token, params, payload):
+        """
+        Remember a verified payload. The entry will never outlive the point
+        at which the token would start relying upon leeway to be accepted.
+        """
+        _, plan = params
+        expires = None
+        exp = payload.get("exp")
+        if plan.options["verify_exp"] and isinstance(exp, (int, float)):
+            expires = exp - plan.leeway
+
+        if expires is None or expires > time.time():
+            self._token_cache.set(token, (params, dict(payload)), expires)
+
     def _get_algorithm(self):
         return self.config.algorithm()
 
+    def _compile_verification_plan(self):
+        return _VerificationPlan(
+            algorithms=[self._get_algorithm()],
+            options={"verify_exp": self.config.verify_exp()},
+            leeway=int(self.config.leeway()),
+            audience=self.config.claim_aud(),
+            issuer=self.config.claim_iss(),
+        )
+
+    def _get_verification_plan(self):
+        """
+        Get the arguments that a token is decoded with.
+        """
+        return self._get_compiled(
+            "verification_plan",
+            verification_settings,
+            self._compile_verification_plan,
+        )
+
     async def _get_payload(self, user, inline_claims=None):
         """
         Given a user object, create a payload and extend it as configured.
         """
-        payload = await utils.call(self.build_payload, user)
+        hooks = self._hooks
+        payload = await hooks.build_payload(user)
 
         if (
             not isinstance(payload, dict)
@@ -212,23 +640,16 @@ class Authentication(BaseAuthentication):
         ):
             raise exceptions.InvalidPayload
 
-        payload = await utils.call(
-            self.add_claims, payload, user, inline_claims
-        )
-
-        extend_payload_args = inspect.getfullargspec(self.extend_payload)
-        args = [payload]
-        if "user" in extend_payload_args.args:
-            args.append(user)
-        payload = await utils.call(self.extend_payload, *args)
+        payload = await hooks.add_claims(payload, user, inline_claims)
+        payload = await hooks.extend_payload(payload, user)
 
         if self.config.scopes_enabled():
-            scopes = await utils.call(self.add_scopes_to_payload, user)
+            scopes = await hooks.add_scopes_to_payload(user)
             if not isinstance(scopes, (tuple, list)):
                 scopes = [scopes]
             payload[self.config.scopes_name()] = scopes
 
-        claims = self.claims + [x.get_key() for x in self._custom_claims]
+        claims = self.claims + tuple(x.get_key() for x in self._custom_claims)
         missing = [x for x in claims if x not in payload]
         if missing:
             logger.debug("")
@@ -248,105 +669,199 @@ class Authentication(BaseAuthentication):
                 self._get_algorithm()
             )
 
+        key_ring = self.config.key_ring()
+        if key_ring is not None:
+            if encode:
+                return key_ring.signing_key[1]
+
+            if not isinstance(token, utils.ParsedToken):
+                token = utils.ParsedToken(token)
+            return key_ring.get_verification_key(token.header.get("kid"))
+
         if self.config.user_secret_enabled():
             if not payload:
-                algorithm = self._get_algorithm()
-                payload = jwt.decode(
-                    token,
-                    options={"verify_signature": False},
-                    algorithms=[algorithm],
-                )
+                if not isinstance(token, utils.ParsedToken):
+                    token = utils.ParsedToken(token)
+                payload = token.payload
             user_id = payload.get("user_id")
-            return await utils.call(
-                self.retrieve_user_secret,
-                user_id=user_id,
-                encode=self._is_asymmetric and encode,
+            return await self._retrieve_user_secret(
+                user_id, encode=self._is_asymmetric and encode
             )
         if self._is_asymmetric and encode:
             return self.config.private_key()
 
         return self.config.secret()
 
-    def _get_token_from_cookies(self, request, refresh_token):
+    async def _retrieve_user_secret(self, user_id, encode=False):
+        """
+        Call retrieve_user_secret, through the user secret cache when it is
+        enabled. Concurrent misses for the same user share a single call.
+        """
+        if self._user_secret_cache is None:
+            return await self._hooks.retrieve_user_secret(
+                user_id=user_id, encode=encode
+            )
+
+        key = (user_id, encode)
+        secret = self._user_secret_cache.get(key, _missing)
+        if secret is not _missing:
+            return secret
+
+        pending = self._user_secret_pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_user_secret(key))
+            self._user_secret_pending[key] = pending
+
+        # Shielded, so that a cancelled request does not cancel the call
+        # for every other request waiting on the same user
+        return await asyncio.shield(pending)
+
+    async def _fetch_user_secret(self, key):
+        user_id, encode = key
+        task = asyncio.current_task()
+        try:
+            secret = await self._hooks.retrieve_user_secret(
+                user_id=user_id, encode=encode
+            )
+            # Do not cache a secret that was invalidated while in flight
+            if self._user_secret_pending.get(key) is task:
+                self._user_secret_cache.set(key, secret)
+            return secret
+        finally:
+            if self._user_secret_pending.get(key) is task:
+                del self._user_secret_pending[key]
+
+    def invalidate_user_secret(self, user_id):
+        """
+        Forget the cached secret of a user, for example after it has been
+        rotated. The next request for that user calls retrieve_user_secret
+        again.
+        """
+        for encode in (False, True):
+            key = (user_id, encode)
+            if self._user_secret_cache is not None:
+                self._user_secret_cache.pop(key)
+            self._user_secret_pending.pop(key, None)
+
+    def _compile_token_lookup(self):
+        config = self.config
+        header_prefix = config.authorization_header_prefix()
+        return _TokenLookup(
+            cookie_set=bool(config.cookie_set()),
+            cookie_strict=bool(config.cookie_strict()),
+            cookie_access_token_name=config.cookie_access_token_name(),
+            cookie_refresh_token_name=config.cookie_refresh_token_name(),
+            cookie_split_signature_name=(
+                config.cookie_split_signature_name()
+                if config.cookie_split()
+                else None
+            ),
+            query_string_set=bool(config.query_string_set()),
+            query_string_strict=bool(config.query_string_strict()),
+            query_string_access_token_name=(
+                config.query_string_access_token_name()
+            ),
+            query_string_refresh_token_name=(
+                config.query_string_refresh_token_name()
+            ),
+            header=config.authorization_header(),
+            header_prefix="{} ".format(header_prefix) if header_prefix else "",
+            refresh_token_name=config.refresh_token_name(),
+        )
+
+    def _get_token_lookup(self):
+        """
+        Get the places, and the names, that a token is looked for in a
+        request.
+        """
+        return self._get_compiled(
+            "token_lookup", token_lookup_settings, self._compile_token_lookup
+        )
+
+    def _get_token_from_cookies(self, request, refresh_token, lookup=None):
         """
         Extract the token if present inside the request cookies.
         """
+        lookup = lookup or self._get_token_lookup()
         if refresh_token:
-            cookie_token_name_key = "cookie_refresh_token_name"
-        else:
-            cookie_token_name_key = "cookie_access_token_name"
-        cookie_token_name = getattr(self.config, cookie_token_name_key)
-        token = request.cookies.get(cookie_token_name(), None)
-        if not refresh_token and self.config.cookie_split() and token:
-            signature_name = self.config.cookie_split_signature_name()
-            token += "." + request.cookies.get(signature_name, "")
+            return request.cookies.get(lookup.cookie_refresh_token_name, None)
+
+        token = request.cookies.get(lookup.cookie_access_token_name, None)
+        if lookup.cookie_split_signature_name and token:
+            token += "." + request.cookies.get(
+                lookup.cookie_split_signature_name, ""
+            )
         return token
 
-    def _get_token_from_headers(self, request, refresh_token):
+    def _get_token_from_headers(self, request, refresh_token, lookup=None):
         """
         Extract the token if present inside the headers of a request.
         """
-        header = request.headers.get(self.config.authorization_header(), None)
+        lookup = lookup or self._get_token_lookup()
+        header = request.headers.get(lookup.header, None)
 
         if header is None:
             return None
 
-        else:
-            header_prefix_key = "authorization_header_prefix"
-            header_prefix = getattr(self.config, header_prefix_key)
-            if header_prefix():
-                try:
-                    prefix, token = header.split(" ")
-                    if prefix != header_prefix():
-                        raise Exception
+        prefix = lookup.header_prefix
+        if prefix:
+            # The header must be exactly "<prefix> <token>"
+            if not header.startswith(prefix):
+                raise exceptions.InvalidAuthorizationHeader()
 
-                except Exception:
-                    raise exceptions.InvalidAuthorizationHeader()
+            start = len(prefix)
+            token = header[start:]
+            if " " in token:
+                raise exceptions.InvalidAuthorizationHeader()
 
-            else:
-                token = header
+        else:
+            token = header
 
-            if refresh_token:
-                token = request.json.get(self.config.refresh_token_name())
+        if refresh_token:
+            token = request.json.get(lookup.refresh_token_name)
 
-            return token
+        return token
 
-    def _get_token_from_query_string(self, request, refresh_token):
+    def _get_token_from_query_string(
+        self, request, refresh_token, lookup=None
+    ):
         """
         Extract the token if present from the request args.
         """
+        lookup = lookup or self._get_token_lookup()
         if refresh_token:
-            query_string_token_name_key = "query_string_refresh_token_name"
+            name = lookup.query_string_refresh_token_name
         else:
-            query_string_token_name_key = "query_string_access_token_name"
-        query_string_token_name = getattr(
-            self.config, query_string_token_name_key
-        )
-        return request.args.get(query_string_token_name(), None)
+            name = lookup.query_string_access_token_name
+        return request.args.get(name, None)
 
     def _get_token(self, request, refresh_token=False):
         """
         Extract a token from a request object.
         """
-        if self.config.cookie_set():
-            token = self._get_token_from_cookies(request, refresh_token)
+        lookup = self._get_token_lookup()
+
+        if lookup.cookie_set:
+            token = self._get_token_from_cookies(
+                request, refresh_token, lookup
+            )
             if token:
                 return token
 
-            else:
-                if self.config.cookie_strict():
-                    raise exceptions.MissingAuthorizationCookie()
+            elif lookup.cookie_strict:
+                raise exceptions.MissingAuthorizationCookie()
 
-        if self.config.query_string_set():
-            token = self._get_token_from_query_string(request, refresh_token)
+        if lookup.query_string_set:
+            token = self._get_token_from_query_string(
+                request, refresh_token, lookup
+            )
             if token:
                 return token
 
-            else:
-                if self.config.query_string_strict():
-                    raise exceptions.MissingAuthorizationQueryArg()
+            elif lookup.query_string_strict:
+                raise exceptions.MissingAuthorizationQueryArg()
 
-        token = self._get_token_from_headers(request, refresh_token)
+        token = self._get_token_from_headers(request, refresh_token, lookup)
 
         if token:
             return token
@@ -388,39 +903,13 @@ class Authentication(BaseAuthentication):
 
         if token:
             try:
-                payload = await self._decode(token, verify=verify)
-            except (
-                jwt.exceptions.ExpiredSignatureError,
-                jwt.exceptions.InvalidIssuerError,
-                jwt.exceptions.ImmatureSignatureError,
-                jwt.exceptions.InvalidIssuedAtError,
-                jwt.exceptions.InvalidAudienceError,
-                InvalidVerificationError,
-                InvalidCustomClaimError,
-            ) as e:
-                # Make sure that the reasons all end with '.' for consistency
-                reason = [
-                    x if x.endswith(".") else "{}.".format(x)
-                    for x in list(e.args)
-                ]
-                payload = None
-                status = 401
-                is_valid = False
-            except jwt.exceptions.DecodeError as e:
-                self._reasons = e.args
-                # Make sure that the reasons all end with '.' for consistency
-                reason = (
-                    [
-                        x if x.endswith(".") else "{}.".format(x)
-                        for x in list(e.args)
-                    ]
-                    if self.config.debug()
-                    else "Auth required."
+                payload = await self._decode_from_request(
+                    request, token, verify=verify
                 )
-                logger.debug(e.args)
-                is_valid = False
+            except verification_errors as e:
+                reason, status = self._get_failure(e)
                 payload = None
-                status = 400 if self.config.debug() else 401
+                is_valid = False
         else:
             payload = None
 
@@ -431,6 +920,35 @@ class Authentication(BaseAuthentication):
 
         return is_valid, status, reason
 
+    def _get_failure(self, exception):
+        """
+        The reasons, and the status, to respond with for a token that could
+        not be verified.
+        """
+        args = exception.args
+        if isinstance(exception, jwt.exceptions.MissingRequiredClaimError):
+            # Its only argument is the name of the claim
+            args = [str(exception)]
+
+        # Make sure that the reasons all end with '.' for consistency
+        reason = [x if x.endswith(".") else "{}.".format(x) for x in args]
+
+        if not isinstance(exception, jwt.exceptions.DecodeError):
+            return reason, 401
+
+        self._reasons = exception.args
+        logger.debug(exception.args)
+        if self.config.debug():
+            return reason, 400
+
+        return "Auth required.", 401
+
+    def _verify_payload(self, payload, inline_claims=None):
+        if self._extra_verifications:
+            self._verify_extras(payload)
+        if self._custom_claims or inline_claims:
+            self._verify_custom_claims(payload, inline_claims=inline_claims)
+
     def _verify_extras(self, payload):
         for verification in self._extra_verifications:
             if not callable(verification):
@@ -444,12 +962,11 @@ class Authentication(BaseAuthentication):
                 raise InvalidVerificationError()
 
     def _verify_custom_claims(self, payload, inline_claims=None):
-        if self._custom_claims:
-            for claim in self._custom_claims:
-                claim._verify(payload)
-        if inline_claims:
-            for claim in inline_claims:
-                claim()._verify(payload)
+        verify = compile_verifier(
+            tuple(self._custom_claims),
+            tuple(inline_claims) if inline_claims else (),
+        )
+        verify(payload)
 
     async def extract_payload(self, request, verify=True, *args, **kwargs):
         """
@@ -479,6 +996,108 @@ class Authentication(BaseAuthentication):
         user_id_attribute = self.config.user_id()
         return payload.get(user_id_attribute, None)
 
+    async def extract_user(self, request, payload=_missing):
+        """
+        Retrieve the user of a request with ``retrieve_user``. The user is
+        kept for the rest of the request, so that decorators, endpoints and
+        handlers can all ask for it, and ``retrieve_user`` is only called
+        once. With ``user_cache_size``, users are also kept across requests
+        made with the same token.
+        """
+        if payload is _missing:
+            payload = await self.extract_payload(request)
+
+        if payload is None:
+            # No valid token: retrieve_user decides, and nothing is kept
+            return await self._hooks.retrieve_user(request, None)
+
+        key = (payload.get(self.config.user_id()), payload.get("iat"))
+        ctx = getattr(request, "ctx", None)
+        retrieved = getattr(ctx, "_sanicjwt_user", None)
+        if (
+            retrieved is not None
+            and retrieved[0] is self
+            and retrieved[1] == key
+        ):
+            return retrieved[2]
+
+        user = _missing
+        if self._user_cache is not None:
+            user = self._user_cache.get(key, _missing)
+
+        if user is _missing:
+            user = await self._retrieve_user(request, payload, key[0])
+            if self._user_cache is not None and user is not None:
+                exp = payload.get("exp")
+                self._user_cache.set(
+                    key,
+                    user,
+                    exp if isinstance(exp, (int, float)) else None,
+                )
+
+        if ctx is not None:
+            ctx._sanicjwt_user = (self, key, user)
+
+        return user
+
+    async def _retrieve_user(self, request, payload, user_id):
+        """
+        Call retrieve_user. Concurrent calls are coalesced when a
+        retrieve_users handler is given, or batch_retrieve_user is enabled.
+        """
+        if user_id is None or not (
+            self.config.batch_retrieve_user() or self._has_retrieve_users()
+        ):
+            return await self._hooks.retrieve_user(request, payload)
+
+        loop = asyncio.get_running_loop()
+        loader = self._user_loader
+        if loader is None or loader.loop is not loop:
+            loader = self._user_loader = _UserLoader(self, loop)
+
+        return await loader.load(request, payload, user_id)
+
+    def _has_retrieve_users(self):
+        method = getattr(self.retrieve_users, "__func__", None)
+        return method is not BaseAuthentication.retrieve_users
+
+    async def _retrieve_users(self, batch):
+        """
+        Retrieve the users of a batch, given as a dict of user ids to the
+        request and payload of the first request for that user. Returns a
+        dict of user ids to either a user, or the exception raised while
+        retrieving it.
+        """
+        user_ids = list(batch)
+        if self._has_retrieve_users():
+            users = await self._hooks.retrieve_users(user_ids)
+            if isinstance(users, dict):
+                return users
+
+            return dict(zip(user_ids, users))
+
+        users = await asyncio.gather(
+            *(
+                self._hooks.retrieve_user(request, payload)
+                for request, payload in batch.values()
+            ),
+            return_exceptions=True,
+        )
+        return dict(zip(user_ids, users))
+
+    def invalidate_user(self, user_id):
+        """
+        Forget the cached user of every token of ``user_id``, for example
+        after the user has been updated. Requests already being handled
+        keep the user they have.
+        """
+        if self._user_cache is None:
+            return
+
+        for key in self._user_cache.keys():
+            if key[0] == user_id:
+                self._user_cache.pop(key)
+
     async def generate_access_token(
         self, user, extend_payload=None, custom_claims=None
     ):
@@ -486,7 +1105,14 @@ class Authentication(BaseAuthentication):
         Generate an access token for a given user.
         """
         payload = await self._get_payload(user, inline_claims=custom_claims)
-        secret = await self._get_secret(payload=payload, encode=True)
+        key_ring = self.config.key_ring()
+        headers = None
+        if key_ring is None:
+            secret = await self._get_secret(payload=payload, encode=True)
+        else:
+            # Read once, so that the kid always matches the key
+            kid, secret = key_ring.signing_key
+            headers = {"kid": kid}
         algorithm = self._get_algorithm()
 
         if extend_payload:
@@ -494,17 +1120,59 @@ class Authentication(BaseAuthentication):
                 extend_payload, payload=payload, user=user
             )
 
-        access_token = jwt.encode(payload, secret, algorithm=algorithm)
+        access_token = await self._crypto.run(
+            crypto.encode, algorithm, payload, secret, algorithm, headers
+        )
         return access_token
 
+    async def generate_access_tokens(
+        self, users, extend_payload=None, custom_claims=None, concurrency=100
+    ):
+        """
+        Generate an access token for each of the given users, returned in
+        the same order. Up to ``concurrency`` tokens are generated at the
+        same time, so that the payload handlers of several users can be
+        awaited together. The registered claims (``exp``, ``iat``, etc) are
+        computed once, and shared by every token of the batch.
+        """
+        users = list(users)
+        tokens = [None] * len(users)
+        pending = iter(enumerate(users))
+
+        async def worker():
+            for index, user in pending:
+                tokens[index] = await self.generate_access_token(
+                    user,
+                    extend_payload=extend_payload,
+                    custom_claims=custom_claims,
+                )
+
+        template = _claims_template.set(self._build_registered_claims())
+        try:
+            workers = [
+                asyncio.ensure_future(worker())
+                for _ in range(min(max(concurrency, 1), len(users)))
+            ]
+        finally:
+            # The workers have their own copy of the context
+            _claims_template.reset(template)
+
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for task in workers:
+                task.cancel()
+            raise
+
+        return tokens
+
     async def generate_refresh_token(self, request, user):
         """
         Generate a refresh token for a given user.
         """
         refresh_token = await utils.call(self.config.generate_refresh_token())
         user_id = await self._get_user_id(user)
-        await utils.call(
-            self.store_refresh_token,
+        await self._hooks.store_refresh_token(
             user_id=user_id,
             refresh_token=refresh_token,
             request=request,
@@ -533,6 +1201,74 @@ class Authentication(BaseAuthentication):
         payload = await self._decode(token, inline_claims=custom_claims)
         return payload if return_payload else bool(payload)
 
+    async def verify_tokens(self, tokens, custom_claims=None):
+        """
+        Verify a batch of tokens. A TokenVerification is returned for each
+        token, in the same order, with either its payload or the reasons
+        why it is not valid. The decode options, and the secret (unless it
+        depends on the token), are only looked up once for the batch.
+        """
+        plan = self._get_verification_plan()
+        secret = None
+        if not self.config.user_secret_enabled() and (
+            self.config.key_ring() is None
+        ):
+            secret = await self._get_secret()
+
+        results = []
+        for token in tokens:
+            try:
+                if not isinstance(token, (str, bytes)):
+                    raise jwt.exceptions.DecodeError("Invalid token type.")
+                payload = await self._decode(
+                    token,
+                    inline_claims=custom_claims,
+                    secret=secret,
+                    plan=plan,
+                )
+            except batch_verification_errors as e:
+                reasons, _ = self._get_failure(e)
+                if not isinstance(reasons, list):
+                    reasons = [reasons]
+                results.append(TokenVerification(False, None, reasons))
+            else:
+                results.append(TokenVerification(True, payload, None))
+
+        return results
+
+    def revoke_token(self, token):
+        """
+        Add an access token, or the payload of one, to the
+        ``revocation_list``, so that it is rejected from now on. It is kept
+        in the list until the token would have expired anyway.
+        """
+        revocation_list = self.config.revocation_list()
+        if revocation_list is None:
+            raise exceptions.InvalidConfiguration(
+                "revoking tokens requires a revocation_list"
+            )
+
+        if isinstance(token, dict):
+            payload = token
+        else:
+            payload = utils.ParsedToken(token).payload
+
+        jti = payload.get("jti")
+        if jti is None:
+            raise exceptions.InvalidToken(
+                "The token does not have a jti claim, enable claim_jti to "
+                "issue tokens that can be revoked."
+            )
+
+        expires = payload.get("exp")
+        if isinstance(expires, (int, float)):
+            # Tokens are accepted for the leeway after they expire
+            expires += self.config.leeway()
+        else:
+            expires = None
+
+        revocation_list.revoke(jti, expires)
+
     @contextmanager
     def override(self, **kwargs):
         self.config._do_overrides(**kwargs)
@@ -1,51 +1,139 @@
 import asyncio
-import sys
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import MappingProxyType
 
 from .exceptions import LoopNotRunning
 
+# The cached mappings are never mutated. Every write sets a new mapping, so
+# that tasks spawned while handling a request (which get a copy of the
+# context) can never leak values back into the request, or into each other.
+_empty = MappingProxyType({})
+_cached = ContextVar("sanicjwt_cached", default=_empty)
+_request = ContextVar("sanicjwt_request", default=None)
+_scoped = ContextVar("sanicjwt_scoped", default=False)
 
-def _get_current_task(loop):  # noqa
-    if sys.version_info[:2] < (3, 7):  # to avoid deprecation warning
-        return asyncio.Task.current_task(loop=loop)
 
-    else:
-        return asyncio.current_task(loop=loop)
+def loop_is_running():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+
+    return True
 
 
 def _check_event_loop():
-    if not asyncio.get_event_loop().is_running():
+    if not loop_is_running():
         raise LoopNotRunning
 
 
-def _get_or_create_cache():
-    loop = asyncio.get_event_loop()
-    try:
-        return _get_current_task(loop)._sanicjwt
-
-    except AttributeError:
-        _get_current_task(loop)._sanicjwt = {}
-        return _get_current_task(loop)._sanicjwt
-
-
 def get_cached(value):
     _check_event_loop()
-    return _get_or_create_cache().get(value, None)
+    return _cached.get().get(value, None)
 
 
 def is_cached(value):
     _check_event_loop()
-    return value in _get_or_create_cache()
+    return value in _cached.get()
 
 
 def to_cache(key, value):
     _check_event_loop()
-    _get_or_create_cache().update({key: value})
+    _cached.set({**_cached.get(), key: value})
+
+
+def get_cached_request():
+    return _request.get()
+
+
+def in_cache_scope():
+    return _scoped.get()
 
 
 def clear_cache():
     _check_event_loop()
-    loop = asyncio.get_event_loop()
+    _cached.set(_empty)
+    _request.set(None)
+
+
+@contextmanager
+def cache_scope(request, values=None):
+    """
+    Make the request, and any values, available from the cache to the code
+    inside the with statement. Whatever was cached before is restored on
+    exit.
+
+    An outermost scope starts from an empty cache. Keep-alive requests on
+    the same connection share a task, so a value cached for one request
+    must never be seen by the next one.
+    """
+    cached = _cached.get() if _scoped.get() else _empty
+    cached_token = _cached.set({**cached, **values} if values else cached)
+    request_token = _request.set(request)
+    scoped_token = _scoped.set(True)
     try:
-        _get_current_task(loop)._sanicjwt = {}
-    except AttributeError:  # noqa
-        pass
+        yield
+    finally:
+        _scoped.reset(scoped_token)
+        _request.reset(request_token)
+        _cached.reset(cached_token)
+
+
+class TTLCache:
+    """
+    A bounded mapping that evicts the least recently used entry once
+    ``maxsize`` is reached. Every entry also expires ``ttl`` seconds after it
+    was stored, or earlier if an explicit deadline is given.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def get(self, key, default=None):
+        try:
+            expires, value = self._data[key]
+        except KeyError:
+            return default
+
+        if expires <= time.time():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value, expires=None):
+        now = time.time()
+        deadline = now + self.ttl
+        if expires is not None and expires < deadline:
+            deadline = expires
+
+        if deadline <= now:
+            self._data.pop(key, None)
+            return
+
+        self._data[key] = (deadline, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def keys(self):
+        return list(self._data)
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        self._data.clear()
@@ -1,15 +1,40 @@
-from sanic_jwt import exceptions
+from functools import lru_cache
+
+from sanic_jwt import exceptions, utils
 
 
 class Claim:
+    # The keys of the claims that must be in the payload before this one
+    # is set up. Claims that do not depend on each other are set up
+    # concurrently.
+    depends_on = ()
+    # Seconds that setup may take, or None for claim_setup_timeout
+    timeout = None
+
     def __init__(self):
         required = ("key", "setup", "verify")
         if any(not hasattr(self, x) for x in required):
             raise exceptions.InvalidCustomClaim()
 
+        self._setup = utils.adapt(self.setup)
+
+    @classmethod
+    def _get_instance(cls):
+        """
+        The instance of the claim class, created on first use and then
+        shared by every token that is generated or verified with it.
+        """
+        # Looked up on the class itself, so that a subclass does not get
+        # the instance of its parent
+        instance = cls.__dict__.get("_instance")
+        if instance is None:
+            instance = cls()
+            cls._instance = instance
+        return instance
+
     @classmethod
     def _register(cls, sanicjwt):
-        instance = cls()
+        instance = cls._get_instance()
         sanicjwt.instance.ctx.auth._custom_claims.add(instance)
 
     def get_key(self):
@@ -25,3 +50,29 @@ class Claim:
         if valid_claim is False:
             message = "Invalid claim: {}".format(key)
             raise exceptions.InvalidCustomClaimError(message=message)
+
+
+@lru_cache(maxsize=1024)
+def compile_verifier(claims, inline_claims=()):
+    """
+    Compiles the verification of a combination of claim instances and
+    inline claim classes into a single function of the payload.
+    """
+    checks = tuple(
+        (claim.get_key(), claim.verify)
+        for claim in claims + tuple(x._get_instance() for x in inline_claims)
+    )
+
+    def verify(payload):
+        for key, check in checks:
+            valid_claim = check(payload.get(key))
+            if valid_claim is True:
+                continue
+
+            if valid_claim is False:
+                message = "Invalid claim: {}".format(key)
+                raise exceptions.InvalidCustomClaimError(message=message)
+
+            raise exceptions.InvalidCustomClaim()
+
+    return verify
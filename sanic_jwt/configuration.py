@@ -1,9 +1,15 @@
-import asyncio
 import copy
 import logging
 
 from . import exceptions, utils
-from .cache import get_cached, is_cached, to_cache
+from .cache import (
+    get_cached,
+    get_cached_request,
+    in_cache_scope,
+    is_cached,
+    loop_is_running,
+    to_cache,
+)
 
 DEFAULT_SECRET = "This is a big secret. Shhhhh"
 
@@ -14,11 +20,14 @@ defaults = {
     "authorization_header": "authorization",
     "authorization_header_prefix": "Bearer",
     "authorization_header_refresh_prefix": "Refresh",
+    "batch_retrieve_user": False,
     "claim_aud": None,
     "claim_iat": False,
     "claim_iss": None,
+    "claim_jti": False,
     "claim_nbf": False,
     "claim_nbf_delta": 0,
+    "claim_setup_timeout": None,
     "cookie_access_token_name": "access_token",
     "cookie_domain": "",
     "cookie_expires": None,
@@ -32,13 +41,21 @@ defaults = {
     "cookie_split": False,
     "cookie_split_signature_name": "access_token_signature",
     "cookie_strict": True,
+    "crypto_executor": "none",
+    "crypto_executor_max_pending": None,
+    "crypto_executor_workers": None,
     "debug": False,
     "do_protection": True,
     "expiration_delta": 60 * 5 * 6,
     "generate_refresh_token": utils.generate_token,
+    "jwks": None,
+    "jwks_endpoint_enabled": False,
+    "jwks_refresh_interval": 300,
+    "key_ring": None,
     "leeway": 60 * 3,
     "login_redirect_url": "/index.html",
     "path_to_authenticate": "/",
+    "path_to_jwks": "/.well-known/jwks.json",
     "path_to_refresh": "/refresh",
     "path_to_retrieve_user": "/me",
     "path_to_verify": "/verify",
@@ -49,14 +66,24 @@ defaults = {
     "query_string_strict": True,
     "refresh_token_enabled": False,
     "refresh_token_name": "refresh_token",
+    "refresh_token_retrieve_user": True,
+    "revocation_list": None,
     "scopes_enabled": False,
     "scopes_name": "scopes",
     "secret": DEFAULT_SECRET,
     "strict_slashes": False,
+    "token_cache_size": 0,
+    "token_cache_ttl": 60,
+    "user_cache_size": 0,
+    "user_cache_ttl": 60,
+    "user_secret_cache_size": 0,
+    "user_secret_cache_ttl": 60,
     "user_secret_enabled": False,
     "url_prefix": "/auth",
     "user_id": "user_id",
     "blueprint_name": "auth_bp",
+    "verify_batch_enabled": False,
+    "verify_batch_limit": 1000,
     "verify_exp": True,
 }
 
@@ -73,6 +100,7 @@ ignore_keys = (
     "extend_payload",
     "retrieve_refresh_token",
     "retrieve_user",
+    "retrieve_users",
     "store_refresh_token",
     "destructure_scopes",
 )
@@ -101,6 +129,7 @@ def _update_config_item(key, item_aliases, instance):
     getattr(instance, key)._item_name = key
     getattr(instance, key)._aliases = item_aliases
     getattr(instance, key)._config = instance
+    getattr(instance, key)._dynamic = None
 
 
 class ConfigItem:
@@ -118,6 +147,7 @@ class ConfigItem:
         self._inject_request = inject_request
         self._override = False
         self._override_value = None
+        self._dynamic = None
 
         if aliases is not None and isinstance(aliases, (list, tuple, set)):
             self._aliases = aliases
@@ -126,26 +156,55 @@ class ConfigItem:
 
     def update(self, value):
         self._value = value
+        if self._config is not None:
+            self._config._revision += 1
 
     def __call__(self, **kwargs):
         if self._override:
             return self._override_value
 
-        if asyncio.get_event_loop().is_running():
+        if self._is_static():
+            return self._value
+
+        if loop_is_running():
             if is_cached(self._item_name):
                 return get_cached(self._item_name)
 
             if self._get_from_config is not None:
                 args = []
 
-                if self._inject_request and is_cached("_request"):  # noqa
-                    args.append(get_cached("_request"))
+                request = get_cached_request()
+                if self._inject_request and request is not None:  # noqa
+                    args.append(request)
                 val = self._get_from_config.__call__(*args)
-                to_cache(self._item_name, val)
+                # Only a scope clears the cache once the request is done
+                if in_cache_scope():
+                    to_cache(self._item_name, val)
                 return val
 
         return self._value
 
+    def _is_static(self):
+        """
+        Whether the value can be returned as is: there is no
+        ``get_<setting>()`` method, and no request is currently overriding
+        it with keyword arguments passed to a decorator.
+        """
+        if self._is_dynamic:
+            return False
+
+        config = self._config
+        return config is None or self._item_name not in (
+            config._instant_overrides
+        )
+
+    @property
+    def _is_dynamic(self):
+        if self._dynamic is None:
+            self._dynamic = self._get_from_config is not None
+
+        return self._dynamic
+
     @property
     def _get_from_config(self):
         if hasattr(self._config, self._get_fn):
@@ -163,6 +222,8 @@ class ConfigItem:
 
 
 class Configuration:
+    _revision = 0
+
     def __iter__(self):  # noqa
         for key in self.config_keys:
             yield getattr(self, key)
@@ -175,6 +236,7 @@ class Configuration:
 
     def __new__(cls, *args, **kwargs):
         instance = super().__new__(cls)
+        instance._instant_overrides = {}
 
         _defaults = copy.deepcopy(defaults)
         _aliases = copy.deepcopy(aliases)
@@ -315,6 +377,9 @@ class Configuration:
 
     def _validate_keys(self):
         logger.debug("validating keys (if needed)")
+        if self.key_ring() is not None or self.jwks() is not None:
+            return
+
         if utils.algorithm_is_asymmetric(self.algorithm()) and (
             self.private_key() is None
             or (
@@ -339,6 +404,7 @@ class Configuration:
             raise exc  # noqa
 
     def _do_overrides(self, cleanup=False, **kwargs):
+        self._revision += 1
         for key, value in kwargs.items():
             if key in self.config_keys:
                 item = getattr(self, key)
@@ -350,6 +416,35 @@ class Configuration:
                 item._override = False if cleanup else True
                 item._override_value = None if cleanup else value
 
+    def _push_instant_overrides(self, keys):
+        for key in keys:
+            self._instant_overrides[key] = (
+                self._instant_overrides.get(key, 0) + 1
+            )
+
+    def _pop_instant_overrides(self, keys):
+        for key in keys:
+            count = self._instant_overrides[key] - 1
+            if count:
+                self._instant_overrides[key] = count
+            else:
+                del self._instant_overrides[key]
+
+    def _is_overridden(self, *keys):
+        """
+        Whether any of the keys is currently overridden for a request by
+        keyword arguments passed to a decorator.
+        """
+        overrides = self._instant_overrides
+        return bool(overrides) and any(key in overrides for key in keys)
+
+    def _is_dynamic(self, *keys):
+        """
+        Whether any of the keys is evaluated on each request with a
+        ``get_<setting>()`` method.
+        """
+        return any(getattr(self, key)._is_dynamic for key in keys)
+
     @staticmethod
     def extract_presets(app_config):
         """
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+import jwt
+
+from . import exceptions, utils
+
+logger = logging.getLogger(__name__)
+
+executor_modes = ("none", "thread", "process")
+
+
+def encode(payload, key, algorithm, headers=None):
+    """
+    Sign a payload. This is a module level function, so that it can be sent
+    to a process pool.
+    """
+    return jwt.encode(
+        payload,
+        utils.prepare_key(key, algorithm),
+        algorithm=algorithm,
+        headers=headers,
+    )
+
+
+def decode(token, key, plan):
+    """
+    Verify the signature of a token, and decode its payload, following a
+    verification plan. This is a module level function, so that it can be
+    sent to a process pool.
+    """
+    return jwt.decode(
+        token,
+        utils.prepare_key(key, plan.algorithms[0]),
+        algorithms=plan.algorithms,
+        options=plan.options,
+        leeway=plan.leeway,
+        audience=plan.audience,
+        issuer=plan.issuer,
+    )
+
+
+def _to_pem(key):
+    # Only key objects of cryptography get here, so it is installed
+    from cryptography.hazmat.primitives import serialization
+
+    if hasattr(key, "private_bytes"):
+        return key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+
+    return key.public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+
+
+class CryptoExecutor:
+    """
+    Run the signing and verification of tokens with an asymmetric algorithm
+    off the event loop, in a pool of threads or processes. HMAC tokens are
+    cheap to sign and verify, and are always handled inline.
+
+    At most ``max_pending`` jobs are handed to the pool at the same time.
+    The pool is started on its first job, so that each server worker gets
+    its own.
+    """
+
+    def __init__(self, mode="none", workers=None, max_pending=None):
+        if mode is None:
+            mode = "none"
+        if mode not in executor_modes:
+            raise exceptions.InvalidConfiguration(
+                "crypto_executor must be one of {}".format(
+                    ", ".join(executor_modes)
+                )
+            )
+
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 2
+        self._executor = None
+        self._semaphore = None
+
+    def offloads(self, algorithm):
+        return self.mode != "none" and utils.algorithm_is_asymmetric(algorithm)
+
+    def _get_executor(self):
+        if self._executor is None:
+            logger.debug(
+                "starting a {} pool of {} workers for signing and "
+                "verifying tokens".format(self.mode, self.workers)
+            )
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="sanic-jwt"
+                )
+
+        return self._executor
+
+    def _get_semaphore(self, loop):
+        # A semaphore belongs to the loop it was first used on
+        if self._semaphore is None or self._semaphore[0] is not loop:
+            self._semaphore = (loop, asyncio.Semaphore(self.max_pending))
+
+        return self._semaphore[1]
+
+    async def run(self, fn, algorithm, data, key, *args):
+        """
+        Call ``fn(data, key, *args)``, where ``fn`` is ``encode`` or
+        ``decode``, inline or in the pool, depending on ``algorithm``.
+        """
+        if not self.offloads(algorithm):
+            return fn(data, key, *args)
+
+        if self.mode == "process" and not isinstance(key, (str, bytes)):
+            # Key objects cannot be pickled, but their PEM can
+            key = _to_pem(key)
+
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore(loop):
+            return await loop.run_in_executor(
+                self._get_executor(), partial(fn, data, key, *args)
+            )
+
+    def shutdown(self, wait=True):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
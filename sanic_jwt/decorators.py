@@ -1,6 +1,5 @@
 import logging
 from contextlib import contextmanager
-from copy import deepcopy
 from functools import wraps
 from inspect import isawaitable
 
@@ -9,35 +8,56 @@ from sanic.response import redirect
 from sanic.views import HTTPMethodView
 
 from . import exceptions, utils
-from .cache import clear_cache, to_cache
-from .validators import validate_scopes
+from .cache import cache_scope
+from .validators import compile_scopes, validate_scopes
 
 logger = logging.getLogger(__name__)
 
 
 @contextmanager
 def instant_config(instance, **kwargs):
-    if kwargs and hasattr(instance.ctx, "auth"):
-        to_cache("_request", kwargs.get("request"))
-        for key, val in kwargs.items():
-            if key in instance.ctx.auth.config:
-                if callable(val):
-                    val = val()
-                to_cache(key, val)
-    yield
-
-    clear_cache()
-
-
-async def _do_protection(*args, **kwargs):
-    initialized_on = kwargs.pop("initialized_on")
-    kw = kwargs.pop("kw")
-    request = kwargs.pop("request")
-    f = kwargs.pop("f")
-
-    use_kwargs = deepcopy(kwargs)
-    if "return_response" in use_kwargs:
-        use_kwargs.pop("return_response")
+    if not kwargs or not hasattr(instance.ctx, "auth"):
+        yield
+        return
+
+    config = instance.ctx.auth.config
+    overrides = None
+    for key, val in kwargs.items():
+        if key in config:
+            if callable(val):
+                val = val()
+            if overrides is None:
+                overrides = {}
+            overrides[key] = val
+
+    if overrides is None:
+        with cache_scope(kwargs.get("request")):
+            yield
+        return
+
+    config._push_instant_overrides(overrides)
+    try:
+        with cache_scope(kwargs.get("request"), overrides):
+            yield
+    finally:
+        config._pop_instant_overrides(overrides)
+
+
+async def _do_protection(
+    request,
+    f,
+    args,
+    kwargs,
+    initialized_on=None,
+    kw=None,
+    return_response=True,
+):
+    """
+    Run the protection on a request. The handler's args and kwargs are
+    passed through untouched, while the decorator's own settings arrive as
+    separate arguments.
+    """
+    kw = kw or {}
 
     if initialized_on and isinstance(initialized_on, Blueprint):
         instance = initialized_on
@@ -46,10 +66,10 @@ async def _do_protection(*args, **kwargs):
 
     with instant_config(instance, request=request, **kw):
         if request.method == "OPTIONS":
-            response = f(request, *args, **use_kwargs)
+            response = f(request, *args, **kwargs)
             if isawaitable(response):  # noqa
                 response = await response
-            if kwargs.get("return_response", True):
+            if return_response:
                 return response
 
             else:
@@ -62,7 +82,7 @@ async def _do_protection(*args, **kwargs):
                     status,
                     reasons,
                 ) = await instance.ctx.auth._check_authentication(
-                    request, request_args=args, request_kwargs=use_kwargs
+                    request, request_args=args, request_kwargs=kwargs
                 )
             else:
                 is_authenticated = True
@@ -89,8 +109,8 @@ async def _do_protection(*args, **kwargs):
             )
 
         if is_authenticated:
-            if kwargs.get("return_response", True):
-                response = f(request, *args, **use_kwargs)
+            if return_response:
+                response = f(request, *args, **kwargs)
                 if isawaitable(response):
                     response = await response
                 return response
@@ -117,15 +137,14 @@ def protected(initialized_on=None, **kw):
         async def decorated_function(request, *args, **kwargs):
             if issubclass(request.__class__, HTTPMethodView):
                 request = args[0]
-            kwargs.update(
-                {
-                    "initialized_on": initialized_on,
-                    "kw": kw,
-                    "request": request,
-                    "f": f,
-                }
+            return await _do_protection(
+                request,
+                f,
+                args,
+                kwargs,
+                initialized_on=initialized_on,
+                kw=kw,
             )
-            return await _do_protection(*args, **kwargs)
 
         return decorated_function
 
@@ -139,6 +158,13 @@ def scoped(
     initialized_on=None,
     **kw
 ):
+    if isinstance(scopes, str) or (
+        isinstance(scopes, (list, tuple))
+        and all(isinstance(x, str) for x in scopes)
+    ):
+        # Parse static scopes now, rather than on the first request
+        compile_scopes(scopes)
+
     def decorator(f):
         @wraps(f)
         async def decorated_function(request, *args, **kwargs):
@@ -146,17 +172,15 @@ def scoped(
                 request = args[0]
 
             if scopes is not None and scopes is not False:
-                protect_kwargs = deepcopy(kwargs)
-                protect_kwargs.update(
-                    {
-                        "initialized_on": initialized_on,
-                        "kw": kw,
-                        "request": request,
-                        "f": f,
-                        "return_response": False,
-                    }
+                _, instance = await _do_protection(
+                    request,
+                    f,
+                    args,
+                    kwargs,
+                    initialized_on=initialized_on,
+                    kw=kw,
+                    return_response=False,
                 )
-                _, instance = await _do_protection(*args, **protect_kwargs)
 
                 if request.method == "OPTIONS":
                     return instance
@@ -240,9 +264,7 @@ def inject_user(initialized_on=None, **kw):
                 payload = await instance.ctx.auth.extract_payload(
                     request, verify=False
                 )
-                user = await utils.call(
-                    instance.ctx.auth.retrieve_user, request, payload
-                )
+                user = await instance.ctx.auth.extract_user(request, payload)
                 response = f(request, user=user, *args, **kwargs)
                 return await response
 
@@ -1,4 +1,8 @@
-from sanic.response import json, text
+import asyncio
+from json import dumps
+
+from sanic.exceptions import MethodNotAllowed
+from sanic.response import json, raw, text
 from sanic.views import HTTPMethodView
 
 from . import exceptions, utils
@@ -28,8 +32,8 @@ class AuthenticateEndpoint(BaseEndpoint):
         request, args, kwargs = await self.do_incoming(request, args, kwargs)
 
         config = self.config
-        user = await utils.call(
-            self.instance.ctx.auth.authenticate, request, *args, **kwargs
+        user = await self.instance.ctx.auth._hooks.authenticate(
+            request, *args, **kwargs
         )
 
         access_token, output = await self.responses.get_access_token_output(
@@ -77,9 +81,7 @@ class RetrieveUserEndpoint(BaseEndpoint):
             raise exceptions.MeEndpointNotSetup()  # noqa
 
         payload = await self.instance.ctx.auth.extract_payload(request)
-        user = await utils.call(
-            self.instance.ctx.auth.retrieve_user, request, payload
-        )
+        user = await self.instance.ctx.auth.extract_user(request, payload)
 
         if not user:  # noqa
             me = None
@@ -139,34 +141,116 @@ class VerifyEndpoint(BaseEndpoint):
 
         return await self.do_response(resp)
 
-
-class RefreshEndpoint(BaseEndpoint):
     async def post(self, request, *args, **kwargs):
+        """
+        Verify a JSON array of tokens. One result per token, in the same
+        order, is sent back as newline delimited JSON.
+        """
+        if not self.config.verify_batch_enabled():
+            raise MethodNotAllowed(
+                "Method POST not allowed for URL {}".format(request.path),
+                method=request.method,
+                allowed_methods=["GET", "OPTIONS"],
+            )
+
         request, args, kwargs = await self.do_incoming(request, args, kwargs)
 
-        # TODO:
-        # - Add more exceptions
-        payload = await self.instance.ctx.auth.extract_payload(
-            request, verify=False
-        )
+        tokens = request.json
+        if not isinstance(tokens, list):
+            raise exceptions.InvalidVerifyRequest()
 
-        try:
-            user = await utils.call(
-                self.instance.ctx.auth.retrieve_user, request, payload=payload
+        limit = self.config.verify_batch_limit()
+        if len(tokens) > limit:
+            raise exceptions.InvalidVerifyRequest(
+                "No more than {} tokens can be verified at once.".format(limit)
             )
+
+        # Every token is verified before responding, so that an error is
+        # not sent as part of a successful response
+        results = await self.instance.ctx.auth.verify_tokens(tokens)
+
+        extra = self.responses.extend_verify(request)
+        lines = []
+        for result in results:
+            output = {"valid": result.valid}
+            if result.valid:
+                output.update({"payload": result.payload})
+            else:
+                output.update(
+                    {
+                        "reasons": result.reasons,
+                        "exception": exceptions.InvalidToken.__name__,
+                    }
+                )
+
+            output.update(extra)
+            output = await self.do_output(output)
+            lines.append(dumps(output) + "\n")
+
+        resp = text("".join(lines), content_type="application/x-ndjson")
+
+        return await self.do_response(resp)
+
+
+class RefreshEndpoint(BaseEndpoint):
+    async def _retrieve_user(self, request, payload):
+        try:
+            return await self.instance.ctx.auth.extract_user(request, payload)
         except exceptions.MeEndpointNotSetup:
             message = "Refresh tokens have not been enabled properly."
             "Perhaps you forgot to initialize with a retrieve_user handler?"
             raise exceptions.RefreshTokenNotImplemented(message=message)
 
-        user_id = await self.instance.ctx.auth._get_user_id(user)
-        refresh_token = await utils.call(
-            self.instance.ctx.auth.retrieve_refresh_token,
-            request=request,
-            user_id=user_id,
+    async def _retrieve_refresh_token(self, request, user_id):
+        refresh_token = (
+            await self.instance.ctx.auth._hooks.retrieve_refresh_token(
+                request=request, user_id=user_id
+            )
         )
         if isinstance(refresh_token, bytes):
             refresh_token = refresh_token.decode("utf-8")
+        return refresh_token
+
+    async def _retrieve_user_and_refresh_token(self, request, payload):
+        user_id = payload.get(self.config.user_id())
+        if user_id is None:
+            # The user is needed to find out who the refresh token belongs to
+            user = await self._retrieve_user(request, payload)
+            user_id = await self.instance.ctx.auth._get_user_id(user)
+            return user, await self._retrieve_refresh_token(request, user_id)
+
+        if not self.config.refresh_token_retrieve_user():
+            user = {self.config.user_id(): user_id}
+            return user, await self._retrieve_refresh_token(request, user_id)
+
+        # Both lookups only need the payload, so they can run together
+        tasks = [
+            asyncio.ensure_future(self._retrieve_user(request, payload)),
+            asyncio.ensure_future(
+                self._retrieve_refresh_token(request, user_id)
+            ),
+        ]
+        try:
+            user, refresh_token = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return user, refresh_token
+
+    async def post(self, request, *args, **kwargs):
+        request, args, kwargs = await self.do_incoming(request, args, kwargs)
+
+        # TODO:
+        # - Add more exceptions
+        payload = await self.instance.ctx.auth.extract_payload(
+            request, verify=False
+        )
+
+        user, refresh_token = await self._retrieve_user_and_refresh_token(
+            request, payload
+        )
 
         token = (
             await self.instance.ctx.auth.retrieve_refresh_token_from_request(
@@ -198,3 +282,14 @@ class RefreshEndpoint(BaseEndpoint):
         )
 
         return await self.do_response(resp)
+
+
+class JWKSEndpoint(BaseEndpoint):
+    async def get(self, request, *args, **kwargs):
+        request, args, kwargs = await self.do_incoming(request, args, kwargs)
+
+        # The body is serialized once per set of keys, not per request
+        body = self.config.key_ring().get_jwks_body(self.config.algorithm())
+        resp = raw(body, content_type="application/json")
+
+        return await self.do_response(resp)
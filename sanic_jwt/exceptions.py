@@ -47,6 +47,13 @@ class InvalidAuthorizationHeader(SanicJWTException):
         super().__init__(message, **kwargs)
 
 
+class InvalidVerifyRequest(SanicJWTException):
+    status_code = 400
+
+    def __init__(self, message="Expected a JSON array of tokens.", **kwargs):
+        super().__init__(message, **kwargs)
+
+
 class InvalidCustomClaim(SanicJWTException):
     status_code = 500
 
@@ -54,6 +61,13 @@ class InvalidCustomClaim(SanicJWTException):
         super().__init__(message, **kwargs)
 
 
+class CustomClaimTimeout(SanicJWTException):
+    status_code = 503
+
+    def __init__(self, message="Custom claim setup timed out.", **kwargs):
+        super().__init__(message, **kwargs)
+
+
 class InvalidCustomClaimError(SanicJWTException):
     status_code = 401
 
@@ -80,6 +94,13 @@ class InvalidVerificationError(SanicJWTException):
         super().__init__(message, **kwargs)
 
 
+class TokenRevoked(SanicJWTException):
+    status_code = 401
+
+    def __init__(self, message="Token has been revoked.", **kwargs):
+        super().__init__(message, **kwargs)
+
+
 class AuthenticateNotImplemented(SanicJWTException):
     status_code = 500
 
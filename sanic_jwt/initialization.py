@@ -1,4 +1,5 @@
 import inspect
+import logging
 from collections import namedtuple
 from types import SimpleNamespace
 from warnings import warn
@@ -9,8 +10,11 @@ from sanic_jwt import endpoints, exceptions
 from sanic_jwt.authentication import Authentication
 from sanic_jwt.configuration import Configuration, DEFAULT_SECRET
 from sanic_jwt.decorators import inject_user, protected, scoped
+from sanic_jwt.keyring import is_url, KeyRing
 from sanic_jwt.responses import Responses
 
+logger = logging.getLogger(__name__)
+
 _Handler = namedtuple(
     "_Handler", ["name", "keys", "exception", "outside_auth_mode"]
 )
@@ -57,6 +61,13 @@ endpoint_mappings = (
         True,
         {"verify_exp": False},
     ),
+    _EndpointMapping(
+        endpoints.JWKSEndpoint,
+        "jwks",
+        ["auth_mode", "jwks_endpoint_enabled"],
+        False,
+        {},
+    ),
 )
 
 auth_mode_handlers = (
@@ -91,7 +102,10 @@ auth_mode_handlers = (
     _Handler("destructure_scopes", None, None, False),
     _Handler("extend_payload", None, None, False),
 )
-auth_mode_agnostic_handlers = (_Handler("retrieve_user", None, None, True),)
+auth_mode_agnostic_handlers = (
+    _Handler("retrieve_user", None, None, True),
+    _Handler("retrieve_users", None, None, True),
+)
 handlers = auth_mode_handlers + auth_mode_agnostic_handlers
 
 init_classes = (
@@ -131,6 +145,7 @@ class Initialize:
         self.__check_deprecated()
         self.__check_classes()
         self.__load_configuration()
+        self.__load_jwks()
         self.__initialize_bp()
         self.__load_responses()
         self.__add_class_views()
@@ -266,6 +281,21 @@ class Initialize:
                 method = self.kwargs.pop(handler.name)
                 setattr(self.instance.ctx.auth, handler.name, method)
 
+        auth = self.instance.ctx.auth
+        auth._get_verification_plan()
+        auth._get_token_lookup()
+        # Wrap the handlers now, rather than on the first request
+        auth._hooks
+
+        if auth._crypto.mode != "none":
+
+            async def stop_crypto_executor(app, loop):
+                auth._crypto.shutdown(wait=False)
+
+            self.app.register_listener(
+                stop_crypto_executor, "after_server_stop"
+            )
+
     def __initialize_claims(self):
         if "extra_verifications" in self.kwargs:
             self.instance.ctx.auth._extra_verifications = self.kwargs.get(
@@ -304,7 +334,11 @@ class Initialize:
                     self.kwargs.update({k: True})
 
         self.config = self.configuration_class(self.app.config, **self.kwargs)
-        if self.config.secret() == DEFAULT_SECRET:
+        if (
+            self.config.secret() == DEFAULT_SECRET
+            and self.config.key_ring() is None
+            and self.config.jwks() is None
+        ):
             warn(
                 "Sanic JWT was initialized using the default secret available "
                 "to the public. DO NOT DEPLOY your application until you "
@@ -314,6 +348,52 @@ class Initialize:
                 "for more information."
             )
 
+    def __load_jwks(self):
+        """
+        Verify tokens with the keys of a JWK Set. A JWK Set that is fetched
+        from a URL is loaded when the server starts, and then refreshed in
+        the background, so that it is never fetched while handling a request.
+        """
+        config = self.config
+        jwks = config.jwks()
+
+        if config.jwks_endpoint_enabled() and config.key_ring() is None:
+            raise exceptions.InvalidConfiguration(
+                "jwks_endpoint_enabled requires a key_ring"
+            )
+
+        if jwks is None:
+            return
+
+        if config.key_ring() is not None:
+            raise exceptions.InvalidConfiguration(
+                "jwks and key_ring cannot be used together"
+            )
+
+        key_ring = KeyRing.from_jwks(jwks, load=not is_url(jwks))
+        config.key_ring.update(key_ring)
+        tasks = []
+
+        async def start_jwks_refresh(app, loop):
+            if is_url(jwks):
+                try:
+                    await key_ring.refresh()
+                except exceptions.SanicJWTException:
+                    logger.exception("could not load the JWK Set")
+
+            interval = config.jwks_refresh_interval()
+            if interval:
+                tasks.append(
+                    loop.create_task(key_ring.refresh_every(interval))
+                )
+
+        async def stop_jwks_refresh(app, loop):
+            while tasks:
+                tasks.pop().cancel()
+
+        self.app.register_listener(start_jwks_refresh, "before_server_start")
+        self.app.register_listener(stop_jwks_refresh, "before_server_stop")
+
     def __load_responses(self):
         self.responses = self.responses_class(self.config, self.instance)
 
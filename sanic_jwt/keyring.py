@@ -0,0 +1,312 @@
+import asyncio
+import json
+import logging
+from collections import namedtuple
+from functools import partial
+from pathlib import Path
+from urllib.request import urlopen
+
+from jwt import PyJWK
+from jwt.algorithms import get_default_algorithms
+from jwt.exceptions import DecodeError, InvalidKeyError, PyJWKError
+
+from . import exceptions, utils
+
+logger = logging.getLogger(__name__)
+
+jwk_suffixes = (".json", ".jwk", ".jwks")
+
+_KeyRingState = namedtuple(
+    "_KeyRingState", ["keys", "signing_kid", "signing_key"]
+)
+
+
+def _parse_jwks(data, origin):
+    try:
+        if isinstance(data, (str, bytes)):
+            data = json.loads(data)
+        entries = data["keys"] if "keys" in data else [data]
+        jwks = [PyJWK(entry) for entry in entries]
+    except (ValueError, KeyError, TypeError, PyJWKError) as e:
+        raise exceptions.InvalidConfiguration(
+            "{} is not a valid JWK or JWK Set: {}".format(origin, e)
+        )
+
+    for jwk in jwks:
+        if not jwk.key_id:
+            raise exceptions.InvalidConfiguration(
+                "every key in {} must have a kid".format(origin)
+            )
+
+    return jwks
+
+
+def _read_text(path):
+    try:
+        return path.read_text()
+    except (OSError, ValueError) as e:
+        raise exceptions.InvalidConfiguration(
+            "could not read {}: {}".format(path, e)
+        )
+
+
+def _read_jwks(path):
+    return _parse_jwks(_read_text(path), path)
+
+
+def is_url(source):
+    return isinstance(source, str) and source.startswith(
+        ("http://", "https://")
+    )
+
+
+def _read_file(path):
+    path = Path(path)
+    if not path.is_file():
+        raise exceptions.ProvidedPathNotFound(
+            "{} is not a valid file".format(path)
+        )
+
+    return path
+
+
+def load_key_files(paths, signing_kid=None, private_key=None):
+    """
+    Read verification keys from PEM files, named after their ``kid``, and
+    from JWK or JWK Set files, which carry their own ``kid``. When given,
+    ``private_key`` is a PEM or JWK file holding the key that tokens are
+    signed with.
+    """
+    keys = {}
+    for path in paths:
+        path = _read_file(path)
+        logger.debug('reading keys from "{}"'.format(path))
+
+        if path.suffix in jwk_suffixes:
+            for jwk in _read_jwks(path):
+                keys[jwk.key_id] = jwk.key
+        else:
+            keys[path.stem] = _read_text(path)
+
+    signing_key = None
+    if private_key is not None:
+        path = _read_file(private_key)
+        if path.suffix in jwk_suffixes:
+            signing_key = _read_jwks(path)[0].key
+        else:
+            signing_key = _read_text(path)
+
+    return keys, signing_kid, signing_key
+
+
+def load_jwks(source, timeout=10):
+    """
+    Read the verification keys of a JWK Set. The ``source`` is either the
+    JWK Set itself (as a dict), the path to a file, or a URL to fetch it
+    from.
+    """
+    if isinstance(source, dict):
+        jwks = _parse_jwks(source, "the JWK Set")
+    elif is_url(source):
+        logger.debug('fetching keys from "{}"'.format(source))
+        try:
+            with urlopen(source, timeout=timeout) as response:
+                data = response.read()
+        except (OSError, ValueError) as e:
+            raise exceptions.InvalidConfiguration(
+                "could not fetch {}: {}".format(source, e)
+            )
+        jwks = _parse_jwks(data, source)
+    else:
+        path = _read_file(source)
+        logger.debug('reading keys from "{}"'.format(path))
+        jwks = _read_jwks(path)
+
+    return {jwk.key_id: jwk.key for jwk in jwks}, None, None
+
+
+class KeyRing:
+    """
+    Verification keys indexed by their key id (``kid``), and the key that
+    new access tokens are signed with. Access tokens are stamped with the
+    ``kid`` of the signing key, and verified with the key matching their
+    ``kid``, so that keys can be rotated while tokens signed with a previous
+    key are still accepted.
+
+    With a symmetric algorithm, the signing key defaults to the
+    verification key of ``signing_kid``. With an asymmetric algorithm, the
+    verification keys are public keys, and ``signing_key`` is the private
+    key matching ``signing_kid``.
+    """
+
+    def __init__(self, keys, signing_kid=None, signing_key=None):
+        self._loader = None
+        self._jwks_body = None
+        self._state = self._build(keys, signing_kid, signing_key)
+
+    @classmethod
+    def from_files(cls, paths, signing_kid=None, private_key=None):
+        """
+        Create a key ring from key files, see ``load_key_files``. It can be
+        read again from the same files with ``reload``.
+        """
+        loader = partial(
+            load_key_files, tuple(paths), signing_kid, private_key
+        )
+        key_ring = cls(*loader())
+        key_ring._loader = loader
+        return key_ring
+
+    @classmethod
+    def from_jwks(cls, source, load=True):
+        """
+        Create a key ring, without a signing key, from a JWK Set, see
+        ``load_jwks``. With ``load=False``, the key ring starts empty until
+        it is loaded with ``reload`` or ``refresh``.
+        """
+        key_ring = cls({})
+        key_ring._loader = partial(load_jwks, source)
+        if load:
+            key_ring.reload()
+        return key_ring
+
+    @staticmethod
+    def _build(keys, signing_kid, signing_key):
+        keys = dict(keys)
+
+        if signing_kid is not None:
+            if signing_kid not in keys:
+                raise exceptions.InvalidConfiguration(
+                    "the signing kid {} is not one of the keys".format(
+                        signing_kid
+                    )
+                )
+            if signing_key is None:
+                signing_key = keys[signing_kid]
+
+        elif signing_key is not None:
+            raise exceptions.InvalidConfiguration(
+                "a signing key needs a signing kid"
+            )
+
+        return _KeyRingState(keys, signing_kid, signing_key)
+
+    def update(self, keys, signing_kid=None, signing_key=None):
+        """
+        Replace all of the keys at once. Requests being verified, and tokens
+        being signed, see either the previous keys or the new ones, never a
+        mix of both.
+        """
+        self._state = self._build(keys, signing_kid, signing_key)
+
+    def _get_loader(self):
+        if self._loader is None:
+            raise exceptions.InvalidConfiguration(
+                "only a key ring created with from_files or from_jwks can be "
+                "reloaded"
+            )
+
+        return self._loader
+
+    def reload(self):
+        """
+        Read the key files again, and swap them in. If any of them cannot be
+        read, the current keys are kept.
+        """
+        self.update(*self._get_loader()())
+
+    async def refresh(self):
+        """
+        The same as ``reload``, with the files read (or the JWK Set fetched)
+        in an executor, so that the event loop is not blocked.
+        """
+        loader = self._get_loader()
+        loop = asyncio.get_running_loop()
+        self.update(*await loop.run_in_executor(None, loader))
+
+    async def refresh_every(self, interval):
+        """
+        Refresh the keys every ``interval`` seconds, until cancelled. When a
+        refresh fails, it is logged, and the current keys are kept.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception:
+                # Whatever went wrong, the keys are refreshed again later
+                logger.exception("could not refresh the key ring")
+
+    def __contains__(self, kid):
+        return kid in self._state.keys
+
+    def __len__(self):
+        return len(self._state.keys)
+
+    @property
+    def kids(self):
+        return tuple(self._state.keys)
+
+    @property
+    def signing_key(self):
+        """
+        A tuple of the ``kid`` and the key that new tokens are signed with.
+        """
+        state = self._state
+        if state.signing_kid is None:
+            raise exceptions.InvalidConfiguration(
+                "the key ring does not have a signing key"
+            )
+
+        return state.signing_kid, state.signing_key
+
+    def to_jwks(self, algorithm):
+        """
+        The public verification keys of the key ring, as a JWK Set for
+        ``algorithm``. Keys of a symmetric algorithm are secrets, and are
+        never included.
+        """
+        keys = []
+        if not utils.algorithm_is_asymmetric(algorithm):
+            return {"keys": keys}
+
+        jwk_algorithm = get_default_algorithms()[algorithm]
+        for kid, key in self._state.keys.items():
+            try:
+                key = utils.prepare_key(key, algorithm)
+            except (InvalidKeyError, ValueError, TypeError):
+                continue
+
+            if hasattr(key, "public_key"):
+                key = key.public_key()
+
+            jwk = jwk_algorithm.to_jwk(key, as_dict=True)
+            jwk.update({"kid": kid, "alg": algorithm, "use": "sig"})
+            keys.append(jwk)
+
+        return {"keys": keys}
+
+    def get_jwks_body(self, algorithm):
+        """
+        ``to_jwks`` serialized to JSON. It is only built again after the
+        keys have changed.
+        """
+        state = self._state
+        cached = self._jwks_body
+        if cached is None or cached[0] is not state or cached[1] != algorithm:
+            body = json.dumps(self.to_jwks(algorithm)).encode("utf-8")
+            cached = self._jwks_body = (state, algorithm, body)
+
+        return cached[2]
+
+    def get_verification_key(self, kid):
+        """
+        The key to verify a token with, given the ``kid`` in its header.
+        """
+        if kid is None:
+            raise DecodeError("The token does not have a key id (kid).")
+
+        try:
+            return self._state.keys[kid]
+        except (KeyError, TypeError):
+            raise DecodeError("Unknown key id (kid).")
@@ -0,0 +1,118 @@
+import heapq
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from . import exceptions
+
+logger = logging.getLogger(__name__)
+
+
+def _timestamp(exp):
+    if isinstance(exp, datetime):
+        if exp.tzinfo is None:
+            exp = exp.replace(tzinfo=timezone.utc)
+        return exp.timestamp()
+
+    return exp
+
+
+class RevocationList:
+    """
+    The ids (``jti``) of access tokens that have been revoked before they
+    expire. An entry is kept until ``expires`` (a timestamp or a datetime),
+    after which the token would be rejected anyway, or forever when it is
+    ``None``.
+
+    Checking a token that has not been revoked is a single dict lookup, and
+    the list is kept small by dropping entries once they have expired.
+    """
+
+    def __init__(self):
+        self._revoked = {}
+        self._expiries = []
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Create a revocation list from a snapshot, see ``save``.
+        """
+        revocation_list = cls()
+        revocation_list.load(path)
+        return revocation_list
+
+    def revoke(self, jti, expires=None):
+        expires = _timestamp(expires)
+        self._revoked[jti] = expires
+        if expires is not None:
+            heapq.heappush(self._expiries, (expires, jti))
+        self.purge()
+
+    def unrevoke(self, jti):
+        self._revoked.pop(jti, None)
+
+    def is_revoked(self, jti):
+        expires = self._revoked.get(jti, False)
+        if expires is False:
+            return False
+
+        return expires is None or expires > time.time()
+
+    def purge(self):
+        """
+        Drop the entries that have expired.
+        """
+        now = time.time()
+        expiries = self._expiries
+        while expiries and expiries[0][0] <= now:
+            expires, jti = heapq.heappop(expiries)
+            # The token may have been revoked again, with a later expiry
+            if self._revoked.get(jti, False) == expires:
+                del self._revoked[jti]
+
+    def __contains__(self, jti):
+        return self.is_revoked(jti)
+
+    def __len__(self):
+        return len(self._revoked)
+
+    def load(self, path):
+        """
+        Add the entries of a snapshot to the list. Entries that have expired
+        since the snapshot was taken are skipped.
+        """
+        path = Path(path)
+        if not path.is_file():
+            raise exceptions.ProvidedPathNotFound(
+                "{} is not a valid file".format(path)
+            )
+
+        logger.debug('reading revoked tokens from "{}"'.format(path))
+        try:
+            revoked = json.loads(path.read_text())["revoked"]
+            entries = [
+                (jti, expires)
+                for jti, expires in revoked.items()
+                if expires is None or isinstance(expires, (int, float))
+            ]
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            raise exceptions.InvalidConfiguration(
+                "{} is not a valid revocation list: {}".format(path, e)
+            )
+
+        for jti, expires in entries:
+            self.revoke(jti, expires)
+
+    def save(self, path):
+        """
+        Write a snapshot of the list. The file is replaced at once, so that
+        it can be loaded while it is being saved.
+        """
+        self.purge()
+        path = Path(path)
+        temporary = path.with_name("{}.tmp".format(path.name))
+        temporary.write_text(json.dumps({"revoked": self._revoked}))
+        os.replace(str(temporary), str(path))
@@ -1,10 +1,17 @@
 import binascii
 import datetime
 import inspect
+import json
 import logging
 import os
+import uuid
+from functools import lru_cache
 from pathlib import Path
 
+from jwt.algorithms import get_default_algorithms
+from jwt.exceptions import DecodeError
+from jwt.utils import base64url_decode
+
 from . import exceptions
 
 logger = logging.getLogger(__name__)
@@ -35,6 +42,10 @@ def build_claim_aud(attr, *args, **kwargs):
     return attr
 
 
+def build_claim_jti(attr, *args, **kwargs):
+    return uuid.uuid4().hex if attr else None
+
+
 async def call(fn, *args, **kwargs):
     if inspect.iscoroutinefunction(fn) or inspect.isawaitable(fn):
         fn = await fn(*args, **kwargs)
@@ -43,6 +54,32 @@ async def call(fn, *args, **kwargs):
     return fn
 
 
+def adapt(fn):
+    """
+    Build a coroutine function that calls ``fn`` the same way that ``call``
+    does. ``fn`` is inspected once, here, rather than on every call.
+    """
+    if inspect.iscoroutinefunction(fn):
+        return fn
+
+    if inspect.isawaitable(fn):
+
+        async def adapter(*args, **kwargs):
+            return await fn(*args, **kwargs)
+
+    elif callable(fn):
+
+        async def adapter(*args, **kwargs):
+            return fn(*args, **kwargs)
+
+    else:
+
+        async def adapter(*args, **kwargs):
+            return fn
+
+    return adapter
+
+
 def load_file_or_str(path_or_str):
     if isinstance(path_or_str, Path):
         if os.path.isfile(str(path_or_str)):
@@ -68,3 +105,93 @@ def algorithm_is_asymmetric(algorithm):
     :return: True if algorithm is asymmetric
     """
     return algorithm.lower()[:2] in ("rs", "es", "ps")
+
+
+def prepare_key(key, algorithm):
+    """
+    Turn a PEM encoded key for an asymmetric ``algorithm`` into the key
+    object that PyJWT would otherwise build from it on every encode and
+    decode. Key objects are cached, so each key is only parsed once. Other
+    keys are returned as they are.
+    """
+    if not isinstance(key, (str, bytes)) or not algorithm_is_asymmetric(
+        algorithm
+    ):
+        return key
+
+    return _prepare_key(key, algorithm)
+
+
+@lru_cache(maxsize=1024)
+def _prepare_key(key, algorithm):
+    algorithms = get_default_algorithms()
+    if algorithm not in algorithms:
+        return key
+
+    return algorithms[algorithm].prepare_key(key)
+
+
+class ParsedToken:
+    """
+    A JWT split into its segments. The header and the payload are decoded
+    at most once, and are NOT verified.
+    """
+
+    __slots__ = (
+        "token",
+        "signing_input",
+        "signature",
+        "_header_segment",
+        "_payload_segment",
+        "_header",
+        "_payload",
+    )
+
+    def __init__(self, token):
+        if isinstance(token, bytes):
+            token = token.decode("utf-8")
+
+        try:
+            signing_input, signature = token.rsplit(".", 1)
+            header_segment, payload_segment = signing_input.split(".", 1)
+        except (AttributeError, ValueError):
+            raise DecodeError("Not enough segments")
+
+        self.token = token
+        self.signing_input = signing_input
+        self.signature = signature
+        self._header_segment = header_segment
+        self._payload_segment = payload_segment
+        self._header = None
+        self._payload = None
+
+    @staticmethod
+    def _load(segment, name):
+        try:
+            data = base64url_decode(segment.encode("utf-8"))
+        except (TypeError, binascii.Error):
+            raise DecodeError("Invalid {} padding".format(name))
+
+        try:
+            value = json.loads(data)
+        except ValueError as e:
+            raise DecodeError("Invalid {} string: {}".format(name, e))
+
+        if not isinstance(value, dict):
+            raise DecodeError(
+                "Invalid {} string: must be a json object".format(name)
+            )
+
+        return value
+
+    @property
+    def header(self):
+        if self._header is None:
+            self._header = self._load(self._header_segment, "header")
+        return self._header
+
+    @property
+    def payload(self):
+        if self._payload is None:
+            self._payload = self._load(self._payload_segment, "payload")
+        return self._payload
@@ -1,5 +1,12 @@
+from collections import namedtuple
+from functools import lru_cache
+
 from sanic_jwt import utils
 
+_Requirement = namedtuple(
+    "_Requirement", ["normalized", "namespace", "actions"]
+)
+
 
 def normalize(scope):
     """
@@ -9,52 +16,131 @@ def normalize(scope):
     return (parts[0], parts[1:])
 
 
-def validate_single_scope(
-    required, user_scopes, require_all_actions=True, override=None
-):
+def compile_scope(scope):
+    """
+    Parses a single required scope into a requirement that can be matched
+    against a ScopeIndex
+    """
+    normalized = normalize(scope)
+    return _Requirement(normalized, normalized[0], frozenset(normalized[1]))
 
-    if not user_scopes:
-        return False
 
-    elif user_scopes.count(None) > 0:
-        if user_scopes.count(None) == len(user_scopes):
-            return False
+@lru_cache(maxsize=1024)
+def _compile_scopes(scopes):
+    return tuple(compile_scope(x) for x in scopes)
 
-        user_scopes = list(filter(lambda v: v is not None, user_scopes))
 
-    required = normalize(required)
-    user_scopes = [normalize(x) for x in user_scopes]
+def compile_scopes(scopes):
+    """
+    Parses the scopes required by a route. The result is cached, so a route
+    only pays for parsing its scopes once.
+    """
+    if not isinstance(scopes, (list, tuple)):
+        scopes = (scopes,)
 
-    is_valid = False
+    try:
+        return _compile_scopes(tuple(scopes))
+    except TypeError:
+        return tuple(compile_scope(x) for x in scopes)
 
-    for requested in user_scopes:
-        if required[0]:
-            valid_namespace = required[0] == requested[0]
-        else:
-            valid_namespace = True
-
-        if required[1]:
-            if len(requested[1]) == 0:
-                valid_actions = True
-            else:
-                method = all if require_all_actions else any
-                valid_actions = method(x in requested[1] for x in required[1])
+
+class ScopeIndex:
+    """
+    A user's scopes, normalized once into the sets of actions that are
+    granted for each namespace. An empty set of actions means that the
+    whole namespace is granted.
+    """
+
+    __slots__ = ("normalized", "namespaces", "granted")
+
+    def __init__(self, user_scopes):
+        self.normalized = []
+        self.namespaces = {}
+        self.granted = []
+
+        for scope in user_scopes or ():
+            if scope is None:
+                continue
+
+            normalized = normalize(scope)
+            actions = frozenset(normalized[1])
+            self.normalized.append(normalized)
+            self.namespaces.setdefault(normalized[0], []).append(actions)
+            self.granted.append(actions)
+
+    def __bool__(self):
+        return bool(self.normalized)
+
+    def match(self, requirement, require_all_actions=True):
+        if requirement.namespace:
+            granted = self.namespaces.get(requirement.namespace, ())
         else:
-            valid_actions = len(requested[1]) == 0
+            granted = self.granted
 
-        is_valid = all([valid_namespace, valid_actions])
+        required = requirement.actions
+        if not required:
+            return any(not actions for actions in granted)
 
-        if is_valid:
-            break
+        for actions in granted:
+            if not actions:
+                return True
+            if require_all_actions:
+                if required <= actions:
+                    return True
+            elif not required.isdisjoint(actions):
+                return True
+
+        return False
+
+
+def get_scope_index(request, user_scopes):
+    """
+    Returns the ScopeIndex of a user's scopes. It is kept on the request
+    context, so nested scope checks on the same request only build it once.
+    """
+    ctx = getattr(request, "ctx", None)
+    cached = getattr(ctx, "_sanicjwt_scopes", None)
+    if cached is not None and cached[0] is user_scopes:
+        return cached[1]
+
+    index = ScopeIndex(user_scopes)
+    if ctx is not None:
+        ctx._sanicjwt_scopes = (user_scopes, index)
+    return index
+
+
+def _validate_requirement(
+    requirement, index, require_all_actions=True, override=None
+):
+    if not index:
+        return False
+
+    is_valid = index.match(requirement, require_all_actions)
 
     outcome = (
-        override(is_valid, required, user_scopes, require_all_actions)
+        override(
+            is_valid,
+            requirement.normalized,
+            index.normalized,
+            require_all_actions,
+        )
         if callable(override)
         else is_valid
     )
     return outcome
 
 
+def validate_single_scope(
+    required, user_scopes, require_all_actions=True, override=None
+):
+    return _validate_requirement(
+        compile_scope(required),
+        ScopeIndex(user_scopes),
+        require_all_actions=require_all_actions,
+        override=override,
+    )
+
+
 async def validate_scopes(
     request,
     scopes,
@@ -69,16 +155,16 @@ async def validate_scopes(
     scopes = await utils.call(destructure, scopes)
     scopes = await utils.call(scopes, request, *request_args, **request_kwargs)
 
-    if not isinstance(scopes, (list, tuple)):
-        scopes = [scopes]
+    if not isinstance(user_scopes, ScopeIndex):
+        user_scopes = get_scope_index(request, user_scopes)
 
     method = all if require_all else any
     return method(
-        validate_single_scope(
+        _validate_requirement(
             x,
             user_scopes,
             require_all_actions=require_all_actions,
             override=override,
         )
-        for x in scopes
+        for x in compile_scopes(scopes)
     )
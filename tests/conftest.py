@@ -1,9 +1,10 @@
+import jwt
 import pytest
 from sanic import Blueprint, Sanic
 from sanic.response import json, text
 
 from sanic_jwt import Claim, exceptions, Initialize
-from sanic_jwt.decorators import protected
+from sanic_jwt.decorators import inject_user, protected
 
 Sanic.test_mode = True
 
@@ -79,6 +80,64 @@ def retrieve_user_secret():
     yield retrieve_user_secret
 
 
+@pytest.fixture
+def get_access_token():
+    def get_access_token(sanic_app, sanic_jwt, username="user1"):
+        _, response = sanic_app.test_client.post(
+            "/auth", json={"username": username, "password": "abcxyz"}
+        )
+        return response.json.get(sanic_jwt.config.access_token_name())
+
+    yield get_access_token
+
+
+@pytest.fixture
+def get_protected():
+    def get_protected(sanic_app, access_token, path="/protected"):
+        _, response = sanic_app.test_client.get(
+            path, headers={"Authorization": "Bearer {}".format(access_token)}
+        )
+        return response
+
+    yield get_protected
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    calls = []
+    decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt, "decode", counting_decode)
+    yield calls
+
+
+@pytest.fixture
+def create_app(authenticate):
+    def create_app(**kwargs):
+        kwargs.setdefault("authenticate", authenticate)
+        sanic_app = Sanic("sanic-jwt-test")
+        sanic_jwt = Initialize(sanic_app, **kwargs)
+
+        @sanic_app.route("/protected")
+        @protected()
+        async def protected_request(request):
+            return json({"protected": True})
+
+        @sanic_app.route("/protected/user")
+        @inject_user()
+        @protected()
+        async def protected_user(request, user):
+            return json({"user_id": user.user_id})
+
+        return sanic_app, sanic_jwt
+
+    yield create_app
+
+
 @pytest.fixture
 def app(username_table, authenticate):
 
@@ -1,9 +1,85 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
 import pytest
+from freezegun import freeze_time
 
 from sanic_jwt import exceptions
-from sanic_jwt.cache import is_cached
+from sanic_jwt.cache import (
+    cache_scope,
+    clear_cache,
+    get_cached,
+    get_cached_request,
+    is_cached,
+    to_cache,
+    TTLCache,
+)
 
 
 def test_cache_is_not_running():
     with pytest.raises(exceptions.LoopNotRunning):
         assert is_cached("_request") is not None
+
+
+def test_ttl_cache_eviction():
+    cache = TTLCache(2, 60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expiration():
+    cache = TTLCache(2, 60)
+    now = datetime.utcnow()
+
+    with freeze_time(now):
+        cache.set("a", 1)
+        cache.set("b", 2, expires=time.time() + 10)
+        cache.set("c", 3, expires=time.time() - 10)
+
+    assert "c" not in cache
+
+    with freeze_time(now + timedelta(seconds=30)):
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+    with freeze_time(now + timedelta(seconds=61)):
+        assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_cache_is_isolated_between_tasks():
+    to_cache("parent", 1)
+
+    async def child():
+        to_cache("child", 2)
+        return get_cached("parent"), get_cached("child")
+
+    assert await asyncio.create_task(child()) == (1, 2)
+    assert is_cached("parent")
+    assert not is_cached("child")
+    clear_cache()
+
+
+@pytest.mark.asyncio
+async def test_cache_scope_restores_previous_values():
+    request = object()
+
+    with cache_scope(request, {"leeway": 1}):
+        assert get_cached("leeway") == 1
+        assert get_cached_request() is request
+
+        with cache_scope(request):
+            to_cache("user_id", "id")
+            assert get_cached("leeway") == 1
+
+        assert not is_cached("user_id")
+
+    assert not is_cached("leeway")
+    assert get_cached_request() is None
@@ -1,7 +1,12 @@
+import asyncio
 from datetime import datetime, timedelta
 
 import jwt
+import pytest
 from freezegun import freeze_time
+from sanic import Sanic
+
+from sanic_jwt import Authentication, exceptions, Initialize
 
 
 def test_unexpired(app):
@@ -278,3 +283,59 @@ def test_aud(app_with_aud):
 
     assert response.status == 200
     assert payload.get("aud") == "clientserver"
+
+
+def test_claims_do_not_grow(app_with_iat):
+    sanic_app, sanic_jwt = app_with_iat
+    auth = sanic_jwt.instance.ctx.auth
+
+    for _ in range(3):
+        _, response = sanic_app.test_client.post(
+            "/auth", json={"username": "user1", "password": "abcxyz"}
+        )
+        assert response.status == 200
+
+    assert auth.claims == ("exp", "iat")
+
+    sanic_jwt.config.claim_iss.update("issuingserver")
+
+    assert auth.claims == ("exp", "iss", "iat")
+
+
+def test_claims_can_be_assigned(authenticate):
+    class MyAuthentication(Authentication):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.claims = ["exp", "username"]
+
+        async def extend_payload(self, payload, user):
+            if "username" in user:
+                payload["username"] = user["username"]
+            return payload
+
+    sanic_app = Sanic("sanic-jwt-test")
+    sanic_jwt = Initialize(
+        sanic_app,
+        authenticate=authenticate,
+        authentication_class=MyAuthentication,
+        claim_iat=True,
+    )
+    auth = sanic_jwt.instance.ctx.auth
+
+    assert auth.claims == ("exp", "username")
+
+    # The assigned claims are required, but do not change which registered
+    # claims are added
+    with pytest.raises(exceptions.MissingRegisteredClaim):
+        asyncio.run(auth.generate_access_token({"user_id": 1}))
+
+    payload = jwt.decode(
+        asyncio.run(
+            auth.generate_access_token({"user_id": 1, "username": "user1"})
+        ),
+        options={"verify_signature": False},
+    )
+    assert "iat" in payload
+
+    auth.claims = None
+    assert auth.claims == ("exp", "iat")
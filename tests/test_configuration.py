@@ -3,6 +3,7 @@ from sanic import Sanic
 from sanic.response import json
 
 from sanic_jwt import Configuration, exceptions, initialize, Initialize
+from sanic_jwt.cache import cache_scope, clear_cache, to_cache
 from sanic_jwt.configuration import ConfigItem
 
 
@@ -372,3 +373,70 @@ def test_configuration_no_set_secret():
     )
     with pytest.warns(UserWarning, match=message):
         Initialize(app, authenticate=lambda: True)
+
+
+@pytest.mark.asyncio
+async def test_configuration_static_item_skips_loop(monkeypatch):
+    class MyConfig(Configuration):
+        def get_access_token_name(self, request=None):
+            return "dynamic"
+
+    config = MyConfig({})
+
+    def fail():
+        pytest.fail("Looked up the event loop for a static setting")
+
+    monkeypatch.setattr("sanic_jwt.configuration.loop_is_running", fail)
+
+    assert config.authorization_header() == "authorization"
+    assert not config.authorization_header._is_dynamic
+
+    monkeypatch.undo()
+
+    assert config.access_token_name() == "dynamic"
+    assert config.access_token_name._is_dynamic
+
+
+@pytest.mark.asyncio
+async def test_configuration_static_item_with_instant_override():
+    config = Configuration({})
+
+    config._push_instant_overrides(["authorization_header"])
+    to_cache("authorization_header", "foobar")
+
+    assert config.authorization_header() == "foobar"
+    assert config.user_id() == "user_id"
+
+    config._pop_instant_overrides(["authorization_header"])
+
+    assert config.authorization_header() == "authorization"
+    clear_cache()
+
+
+@pytest.mark.asyncio
+async def test_configuration_getter_not_kept_across_requests():
+    calls = []
+
+    class MyConfig(Configuration):
+        def get_expiration_delta(self, request=None):
+            calls.append(request)
+            return 100 + len(calls)
+
+    config = MyConfig({})
+    first, second = object(), object()
+
+    # Keep-alive requests on one connection all run in the same task, so
+    # outside of a decorator nothing is kept
+    assert config.expiration_delta() == 101
+    assert config.expiration_delta() == 102
+
+    with cache_scope(first):
+        assert config.expiration_delta() == 103
+        assert config.expiration_delta() == 103
+
+    assert config.expiration_delta() == 104
+
+    with cache_scope(second):
+        assert config.expiration_delta() == 105
+
+    assert calls == [None, None, first, None, second]
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import jwt
+import pytest
+
+from sanic_jwt import exceptions
+from sanic_jwt.crypto import CryptoExecutor, decode, encode
+
+resources = Path(__file__).parent / "resources"
+
+
+@pytest.fixture
+def crypto_threads(monkeypatch):
+    threads = []
+    encode = jwt.encode
+    decode = jwt.decode
+
+    def recording_encode(*args, **kwargs):
+        threads.append(("encode", threading.current_thread()))
+        return encode(*args, **kwargs)
+
+    def recording_decode(*args, **kwargs):
+        threads.append(("decode", threading.current_thread()))
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt, "encode", recording_encode)
+    monkeypatch.setattr(jwt, "decode", recording_decode)
+    yield threads
+
+
+@pytest.fixture
+def access_protected(get_access_token, get_protected):
+    def access_protected(sanic_app, sanic_jwt):
+        access_token = get_access_token(sanic_app, sanic_jwt)
+        response = get_protected(sanic_app, access_token)
+        assert response.status == 200
+        assert response.json.get("protected") is True
+
+    yield access_protected
+
+
+def test_asymmetric_crypto_in_thread_pool(
+    create_app, access_protected, crypto_threads
+):
+    app, sanicjwt = create_app(
+        algorithm="RS256",
+        public_key=resources / "rsa-test-public.pem",
+        private_key=resources / "rsa-test-key.pem",
+        crypto_executor="thread",
+        crypto_executor_workers=2,
+    )
+
+    access_protected(app, sanicjwt)
+
+    assert [name for name, _ in crypto_threads] == ["encode", "decode"]
+    for _, thread in crypto_threads:
+        assert thread.name.startswith("sanic-jwt")
+
+    # The pool is shut down with the server
+    assert sanicjwt.instance.ctx.auth._crypto._executor is None
+
+
+def test_symmetric_crypto_stays_inline(
+    create_app, access_protected, crypto_threads
+):
+    app, sanicjwt = create_app(crypto_executor="thread")
+
+    access_protected(app, sanicjwt)
+
+    assert [name for name, _ in crypto_threads] == ["encode", "decode"]
+    for _, thread in crypto_threads:
+        assert not thread.name.startswith("sanic-jwt")
+    assert sanicjwt.instance.ctx.auth._crypto._executor is None
+
+
+def test_crypto_executor_is_off_by_default(
+    create_app, access_protected, crypto_threads
+):
+    app, sanicjwt = create_app(
+        algorithm="RS256",
+        public_key=resources / "rsa-test-public.pem",
+        private_key=resources / "rsa-test-key.pem",
+    )
+
+    access_protected(app, sanicjwt)
+
+    for _, thread in crypto_threads:
+        assert not thread.name.startswith("sanic-jwt")
+
+
+def test_invalid_crypto_executor(create_app):
+    with pytest.raises(exceptions.InvalidConfiguration):
+        create_app(crypto_executor="fibers")
+
+
+@pytest.mark.asyncio
+async def test_process_pool_with_key_objects(create_app):
+    from cryptography.hazmat.primitives.serialization import (
+        load_pem_private_key,
+        load_pem_public_key,
+    )
+
+    private_key = load_pem_private_key(
+        (resources / "rsa-test-key.pem").read_bytes(), None
+    )
+    public_key = load_pem_public_key(
+        (resources / "rsa-test-public.pem").read_bytes()
+    )
+    _, sanicjwt = create_app(
+        algorithm="RS256",
+        public_key=public_key,
+        private_key=private_key,
+    )
+    plan = sanicjwt.instance.ctx.auth._get_verification_plan()
+
+    executor = CryptoExecutor("process", workers=1)
+    try:
+        token = await executor.run(
+            encode, "RS256", {"user_id": 1}, private_key, "RS256"
+        )
+        payload = await executor.run(decode, "RS256", token, public_key, plan)
+    finally:
+        executor.shutdown()
+
+    assert payload == {"user_id": 1}
+
+
+@pytest.mark.asyncio
+async def test_pending_jobs_are_bounded():
+    executor = CryptoExecutor("thread", workers=4, max_pending=2)
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def slow(data, key):
+        with lock:
+            running.append(data)
+            peak.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(data)
+        return data
+
+    try:
+        results = await asyncio.gather(
+            *(executor.run(slow, "RS256", i, "key") for i in range(10))
+        )
+    finally:
+        executor.shutdown()
+
+    assert results == list(range(10))
+    assert max(peak) <= 2
@@ -1,3 +1,5 @@
+import asyncio
+
 import jwt
 import pytest
 from sanic import Sanic
@@ -131,3 +133,183 @@ def test_custom_claim_non_boolean_return():
 
     with pytest.raises(exceptions.InvalidCustomClaim):
         myclaim._verify(payload)
+
+
+def _claim(claim_key, value, delay=0, requires=(), seconds=None, log=None):
+    class SlowClaim(Claim):
+        key = claim_key
+        depends_on = requires
+        timeout = seconds
+
+        async def setup(self, payload, user):
+            if log is not None:
+                log.append(("start", claim_key))
+            await asyncio.sleep(delay)
+            if log is not None:
+                log.append(("end", claim_key))
+            missing = [x for x in requires if x not in payload]
+            assert not missing
+            return value
+
+        def verify(self, value):
+            return True
+
+    return SlowClaim
+
+
+def _initialize(authenticate, claims, **kwargs):
+    sanic_app = Sanic("sanic-jwt-test")
+    sanic_jwt = Initialize(
+        sanic_app, authenticate=authenticate, custom_claims=claims, **kwargs
+    )
+    return sanic_jwt.instance.ctx.auth
+
+
+def test_custom_claims_setup_concurrently(authenticate):
+    log = []
+    auth = _initialize(
+        authenticate,
+        [_claim("foo", 1, 0.01, log=log), _claim("bar", 2, 0.01, log=log)],
+    )
+
+    payload = asyncio.run(auth.add_claims({"user_id": 1}, None))
+
+    assert payload["foo"] == 1
+    assert payload["bar"] == 2
+    assert [event for event, _ in log] == ["start", "start", "end", "end"]
+
+
+def test_custom_claims_depends_on(authenticate):
+    log = []
+    auth = _initialize(
+        authenticate,
+        [
+            _claim("entitlements", 3, requires=("tenant",), log=log),
+            _claim("tenant", 1, 0.01, log=log),
+            _claim("region", 2, requires=("exp",), log=log),
+        ],
+    )
+
+    payload = asyncio.run(auth.add_claims({"user_id": 1}, None))
+
+    assert payload["entitlements"] == 3
+    assert log.index(("end", "tenant")) < log.index(("start", "entitlements"))
+
+    # Inline claims can depend on the registered custom claims
+    inline = [_claim("seat", 4, requires=("entitlements",))]
+    payload = asyncio.run(auth.add_claims({"user_id": 1}, None, inline))
+    assert payload["seat"] == 4
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [
+        [_claim("foo", 1, requires=("unknown",))],
+        [
+            _claim("foo", 1, requires=("bar",)),
+            _claim("bar", 2, requires=("foo",)),
+        ],
+    ],
+)
+def test_custom_claims_depends_on_unmet(authenticate, claims):
+    auth = _initialize(authenticate, claims)
+
+    with pytest.raises(exceptions.InvalidCustomClaim):
+        asyncio.run(auth.add_claims({"user_id": 1}, None))
+
+
+def test_custom_claims_timeout(authenticate):
+    auth = _initialize(
+        authenticate,
+        [_claim("foo", 1, 1), _claim("bar", 2)],
+        claim_setup_timeout=0.01,
+    )
+
+    with pytest.raises(exceptions.CustomClaimTimeout):
+        asyncio.run(auth.add_claims({"user_id": 1}, None))
+
+    # A claim can allow itself more time than the default
+    auth = _initialize(
+        authenticate,
+        [_claim("foo", 1, 0.02, seconds=1)],
+        claim_setup_timeout=0.01,
+    )
+    assert asyncio.run(auth.add_claims({"user_id": 1}, None))["foo"] == 1
+
+
+def test_inline_claims_are_instantiated_once(app):
+    sanic_app, sanic_jwt = app
+    auth = sanic_jwt.instance.ctx.auth
+    instances = []
+
+    class Tenant(Claim):
+        key = "tenant"
+
+        def __init__(self):
+            super().__init__()
+            instances.append(self)
+
+        def setup(self, payload, user):
+            return "acme"
+
+        def verify(self, value):
+            return value == "acme"
+
+    class OtherTenant(Tenant):
+        def setup(self, payload, user):
+            return "other"
+
+    async def run():
+        tokens = [
+            await auth.generate_access_token(
+                {"user_id": 1}, custom_claims=[Tenant]
+            )
+            for _ in range(3)
+        ]
+        for token in tokens:
+            await auth._decode(token, inline_claims=[Tenant])
+
+        other = await auth.generate_access_token(
+            {"user_id": 1}, custom_claims=[OtherTenant]
+        )
+        with pytest.raises(exceptions.InvalidCustomClaimError):
+            await auth._decode(other, inline_claims=[OtherTenant])
+
+    asyncio.run(run())
+
+    assert [type(instance) for instance in instances] == [
+        Tenant,
+        OtherTenant,
+    ]
+
+
+def test_compiled_claims_verifier(app_with_custom_claims):
+    sanic_app, sanic_jwt = app_with_custom_claims
+    auth = sanic_jwt.instance.ctx.auth
+
+    class Tenant(Claim):
+        key = "tenant"
+
+        def setup(self, payload, user):
+            return "acme"
+
+        def verify(self, value):
+            return value
+
+    payload = {"username": "user2", "tenant": True}
+    auth._verify_custom_claims(payload, inline_claims=[Tenant])
+    auth._verify_custom_claims(payload, inline_claims=(Tenant,))
+
+    with pytest.raises(exceptions.InvalidCustomClaimError) as e:
+        auth._verify_custom_claims(
+            {"username": "user2", "tenant": False}, inline_claims=[Tenant]
+        )
+    assert e.value.args[0] == "Invalid claim: tenant"
+
+    with pytest.raises(exceptions.InvalidCustomClaim):
+        auth._verify_custom_claims(
+            {"username": "user2", "tenant": 1}, inline_claims=[Tenant]
+        )
+
+    with pytest.raises(exceptions.InvalidCustomClaimError):
+        auth._verify_custom_claims({"username": "user1"})
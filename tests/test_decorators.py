@@ -93,6 +93,30 @@ def test_inject_user_regular(app_with_retrieve_user):
     assert response.json.get("user_id") == 1
 
 
+def test_inject_user_without_token(app_with_retrieve_user):
+    sanic_app, sanic_jwt = app_with_retrieve_user
+    _, response = sanic_app.test_client.post(
+        "/auth", json={"username": "user1", "password": "abcxyz"}
+    )
+    access_token = response.json.get(sanic_jwt.config.access_token_name())
+
+    @sanic_app.route("/optional/user")
+    @inject_user()
+    async def my_optional_user(request, user):
+        return json({"user_id": user.user_id if user else None})
+
+    _, response = sanic_app.test_client.get("/optional/user")
+    assert response.status == 200
+    assert response.json.get("user_id") is None
+
+    _, response = sanic_app.test_client.get(
+        "/optional/user",
+        headers={"Authorization": "Bearer {}".format(access_token)},
+    )
+    assert response.status == 200
+    assert response.json.get("user_id") == 1
+
+
 def test_inject_user_on_instance(app_with_retrieve_user):
     sanic_app, sanic_jwt = app_with_retrieve_user
     _, response = sanic_app.test_client.post(
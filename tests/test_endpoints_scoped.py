@@ -1273,3 +1273,29 @@ def test_scoped_with_destructure(app_with_scopes_destructure):
     )
 
     assert response.status == 200
+
+
+def test_nested_scopes(app_with_scopes):
+    sanic_app, sanicjwt = app_with_scopes
+
+    @sanic_app.route("/protected/nested_scopes")
+    @sanicjwt.scoped("user")
+    @sanicjwt.scoped("admin")
+    @sanicjwt.scoped(["user", "admin"])
+    async def nested_scopes_route(request):
+        return json({"nested": True})
+
+    for username, status in (("user2", 200), ("user1", 403)):
+        _, response = sanic_app.test_client.post(
+            "/auth", json={"username": username, "password": "abcxyz"}
+        )
+        access_token = response.json.get(
+            sanicjwt.config.access_token_name(), None
+        )
+
+        _, response = sanic_app.test_client.get(
+            "/protected/nested_scopes",
+            headers={"Authorization": "Bearer {}".format(access_token)},
+        )
+
+        assert response.status == status
@@ -144,3 +144,33 @@ def test_extend_with_mising_claim():
 
     assert response.json.get("exception") == "MissingRegisteredClaim"
     assert response.status == 500
+
+
+def test_extend_replaced_after_initialize():
+    def my_extender(payload):
+        payload.update({"foo": "bar"})
+        return payload
+
+    async def my_other_extender(payload, user):
+        payload.update({"foo": user.username})
+        return payload
+
+    app = Sanic("sanic-jwt-test")
+    sanicjwt = Initialize(
+        app, authenticate=authenticate, extend_payload=my_extender
+    )
+    sanicjwt.instance.ctx.auth.extend_payload = my_other_extender
+
+    _, response = app.test_client.post(
+        "/auth", json={"username": "user1", "password": "abcxyz"}
+    )
+    assert response.status == 200
+
+    access_token = response.json.get(sanicjwt.config.access_token_name(), None)
+    payload = jwt.decode(
+        access_token,
+        sanicjwt.config.secret(),
+        algorithms=sanicjwt.config.algorithm(),
+    )
+
+    assert payload.get("foo") == "user1"
@@ -0,0 +1,72 @@
+import asyncio
+
+import jwt
+import pytest
+from sanic import Sanic
+
+from sanic_jwt import exceptions, Initialize
+from sanic_jwt.authentication import _claims_template
+
+
+@pytest.fixture
+def bulk_app(authenticate):
+    running = {"now": 0, "max": 0}
+
+    async def add_scopes_to_payload(user):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0.001)
+        running["now"] -= 1
+        return ["user:{}".format(user["user_id"])]
+
+    sanic_app = Sanic("sanic-jwt-test")
+    sanic_jwt = Initialize(
+        sanic_app,
+        authenticate=authenticate,
+        scopes_enabled=True,
+        add_scopes_to_payload=add_scopes_to_payload,
+        claim_iat=True,
+    )
+
+    yield sanic_app, sanic_jwt, running
+
+
+@pytest.mark.asyncio
+async def test_generate_access_tokens(bulk_app):
+    sanic_app, sanic_jwt, running = bulk_app
+    auth = sanic_app.ctx.auth
+    users = [{"user_id": i} for i in range(50)]
+
+    tokens = await auth.generate_access_tokens(users, concurrency=10)
+
+    payloads = [
+        jwt.decode(token, sanic_jwt.config.secret(), algorithms=["HS256"])
+        for token in tokens
+    ]
+    assert [payload["user_id"] for payload in payloads] == list(range(50))
+    assert [payload["scopes"] for payload in payloads] == [
+        ["user:{}".format(i)] for i in range(50)
+    ]
+    assert len({(payload["exp"], payload["iat"]) for payload in payloads}) == 1
+    assert 1 < running["max"] <= 10
+
+
+@pytest.mark.asyncio
+async def test_generate_access_tokens_does_not_leak_template(bulk_app):
+    sanic_app, _, _ = bulk_app
+    auth = sanic_app.ctx.auth
+
+    assert await auth.generate_access_tokens([]) == []
+    await auth.generate_access_tokens([{"user_id": 1}])
+
+    assert _claims_template.get() is None
+
+
+@pytest.mark.asyncio
+async def test_generate_access_tokens_failure(bulk_app):
+    sanic_app, _, _ = bulk_app
+    auth = sanic_app.ctx.auth
+    users = [{"user_id": i} for i in range(5)] + [object()]
+
+    with pytest.raises(exceptions.InvalidRetrieveUserObject):
+        await auth.generate_access_tokens(users, concurrency=2)
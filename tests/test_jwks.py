@@ -0,0 +1,215 @@
+import asyncio
+import json
+from io import BytesIO
+from pathlib import Path
+
+import jwt
+import pytest
+from sanic import Sanic
+from sanic.response import json as json_response
+
+from sanic_jwt import exceptions, Initialize, KeyRing
+from sanic_jwt import keyring as keyring_module
+
+resources = Path(__file__).parent / "resources"
+public_key = (resources / "rsa-test-public.pem").read_text()
+private_key = (resources / "rsa-test-key.pem").read_text()
+
+
+async def authenticate(request, *args, **kwargs):
+    return {"user_id": 1}
+
+
+@pytest.fixture
+def auth_app():
+    key_ring = KeyRing(
+        {"rsa": public_key, "hmac": "a secret"},
+        signing_kid="rsa",
+        signing_key=private_key,
+    )
+    sanic_app = Sanic("sanic-jwt-test")
+    sanic_jwt = Initialize(
+        sanic_app,
+        authenticate=authenticate,
+        algorithm="RS256",
+        key_ring=key_ring,
+        jwks_endpoint_enabled=True,
+    )
+    yield sanic_app, sanic_jwt
+
+
+def create_microservice(jwks, **kwargs):
+    microservice_app = Sanic("sanic-jwt-test-microservice")
+    microservice_sanic_jwt = Initialize(
+        microservice_app,
+        auth_mode=False,
+        algorithm="RS256",
+        jwks=jwks,
+        **kwargs
+    )
+
+    @microservice_app.route("/protected")
+    @microservice_sanic_jwt.protected()
+    async def protected_request(request):
+        return json_response({"protected": True})
+
+    return microservice_app, microservice_sanic_jwt
+
+
+def test_jwks_endpoint(auth_app):
+    sanic_app, sanic_jwt = auth_app
+
+    _, response = sanic_app.test_client.get("/auth/.well-known/jwks.json")
+
+    assert response.status == 200
+    assert response.headers["content-type"] == "application/json"
+    keys = response.json["keys"]
+    assert [key["kid"] for key in keys] == ["rsa"]
+    assert keys[0]["kty"] == "RSA"
+    assert "d" not in keys[0]
+
+    key_ring = sanic_jwt.config.key_ring()
+    body = key_ring.get_jwks_body("RS256")
+    assert key_ring.get_jwks_body("RS256") is body
+
+    key_ring.update({"other": public_key})
+    assert key_ring.get_jwks_body("RS256") is not body
+
+
+def test_jwks_endpoint_requires_key_ring():
+    with pytest.raises(exceptions.InvalidConfiguration):
+        Initialize(
+            Sanic("sanic-jwt-test"),
+            authenticate=authenticate,
+            jwks_endpoint_enabled=True,
+        )
+
+
+def test_jwks_file(auth_app, tmp_path):
+    sanic_app, sanic_jwt = auth_app
+    _, response = sanic_app.test_client.get("/auth/.well-known/jwks.json")
+    jwks_path = tmp_path / "jwks.json"
+    jwks_path.write_text(response.text)
+
+    _, response = sanic_app.test_client.post(
+        "/auth", json={"username": "user1", "password": "abcxyz"}
+    )
+    access_token = response.json.get(sanic_jwt.config.access_token_name())
+
+    microservice_app, _ = create_microservice(str(jwks_path))
+    _, response = microservice_app.test_client.get(
+        "/protected",
+        headers={"Authorization": "Bearer {}".format(access_token)},
+    )
+
+    assert response.status == 200
+    assert response.json.get("protected") is True
+
+    forged = jwt.encode(
+        {"user_id": 1}, "a secret", algorithm="HS256", headers={"kid": "hmac"}
+    )
+    _, response = microservice_app.test_client.get(
+        "/protected",
+        headers={"Authorization": "Bearer {}".format(forged)},
+    )
+
+    assert response.status == 401
+
+
+def test_jwks_url(auth_app, monkeypatch):
+    sanic_app, sanic_jwt = auth_app
+    _, response = sanic_app.test_client.get("/auth/.well-known/jwks.json")
+    body = response.body
+    fetched = []
+
+    def urlopen(url, timeout):
+        fetched.append(url)
+        return BytesIO(body)
+
+    monkeypatch.setattr(keyring_module, "urlopen", urlopen)
+
+    _, response = sanic_app.test_client.post(
+        "/auth", json={"username": "user1", "password": "abcxyz"}
+    )
+    access_token = response.json.get(sanic_jwt.config.access_token_name())
+
+    url = "http://auth/auth/.well-known/jwks.json"
+    microservice_app, microservice_sanic_jwt = create_microservice(url)
+
+    # Nothing is fetched until the server starts
+    assert fetched == []
+    assert len(microservice_sanic_jwt.config.key_ring()) == 0
+
+    _, response = microservice_app.test_client.get(
+        "/protected",
+        headers={"Authorization": "Bearer {}".format(access_token)},
+    )
+
+    assert response.status == 200
+    assert fetched == [url]
+
+
+@pytest.mark.asyncio
+async def test_key_ring_refresh_every(tmp_path):
+    jwks_path = tmp_path / "jwks.json"
+    jwks_path.write_text(
+        json.dumps({"kty": "oct", "kid": "a", "k": "c2VjcmV0"})
+    )
+    key_ring = KeyRing.from_jwks(str(jwks_path))
+    task = asyncio.ensure_future(key_ring.refresh_every(0.01))
+
+    try:
+        jwks_path.write_text("not json")
+        await asyncio.sleep(0.05)
+        assert key_ring.kids == ("a",)
+
+        jwks_path.write_bytes(b"\xff\xfe not utf-8")
+        await asyncio.sleep(0.05)
+        assert key_ring.kids == ("a",)
+        assert not task.done()
+
+        jwks_path.write_text(
+            json.dumps({"kty": "oct", "kid": "b", "k": "c2VjcmV0"})
+        )
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if key_ring.kids == ("b",):
+                break
+
+        assert key_ring.kids == ("b",)
+    finally:
+        task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_key_ring_refresh_every_survives_errors():
+    calls = []
+
+    def loader():
+        calls.append(None)
+        if len(calls) == 1:
+            raise RuntimeError("unexpected")
+        return {"b": "second secret"}, None, None
+
+    key_ring = KeyRing({"a": "first secret"})
+    key_ring._loader = loader
+    task = asyncio.ensure_future(key_ring.refresh_every(0.01))
+
+    try:
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if key_ring.kids == ("b",):
+                break
+
+        assert key_ring.kids == ("b",)
+        assert not task.done()
+    finally:
+        task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_key_ring_refresh_without_files():
+    key_ring = KeyRing({"a": "first secret"})
+
+    with pytest.raises(exceptions.InvalidConfiguration):
+        await key_ring.refresh()
@@ -0,0 +1,131 @@
+import json
+import shutil
+from pathlib import Path
+
+import jwt
+import pytest
+from sanic import Sanic
+from sanic.response import json as json_response
+
+from sanic_jwt import exceptions, Initialize, KeyRing, protected
+
+resources = Path(__file__).parent / "resources"
+
+
+def create_app(authenticate, key_ring, **kwargs):
+    sanic_app = Sanic("sanic-jwt-test")
+    sanic_jwt = Initialize(
+        sanic_app, authenticate=authenticate, key_ring=key_ring, **kwargs
+    )
+
+    @sanic_app.route("/protected")
+    @protected()
+    async def protected_request(request):
+        return json_response({"protected": True})
+
+    return sanic_app, sanic_jwt
+
+
+def test_key_ring_rotation(authenticate, get_access_token, get_protected):
+    key_ring = KeyRing({"one": "first secret"}, signing_kid="one")
+    sanic_app, sanic_jwt = create_app(authenticate, key_ring)
+
+    first = get_access_token(sanic_app, sanic_jwt)
+    assert jwt.get_unverified_header(first)["kid"] == "one"
+    assert get_protected(sanic_app, first).status == 200
+
+    key_ring.update(
+        {"one": "first secret", "two": "second secret"}, signing_kid="two"
+    )
+    second = get_access_token(sanic_app, sanic_jwt)
+
+    assert jwt.get_unverified_header(second)["kid"] == "two"
+    assert get_protected(sanic_app, first).status == 200
+    assert get_protected(sanic_app, second).status == 200
+
+    key_ring.update({"two": "second secret"}, signing_kid="two")
+
+    assert get_protected(sanic_app, first).status == 401
+    assert get_protected(sanic_app, second).status == 200
+
+
+def test_key_ring_unknown_kid(authenticate, get_protected):
+    key_ring = KeyRing({"one": "first secret"}, signing_kid="one")
+    sanic_app, _ = create_app(authenticate, key_ring, debug=True)
+
+    unknown = jwt.encode(
+        {"user_id": 1}, "first secret", headers={"kid": "other"}
+    )
+    response = get_protected(sanic_app, unknown)
+    assert response.status == 400
+    assert "Unknown key id (kid)." in response.json.get("reasons")
+
+    missing = jwt.encode({"user_id": 1}, "first secret")
+    response = get_protected(sanic_app, missing)
+    assert response.status == 400
+    assert "The token does not have a key id (kid)." in response.json.get(
+        "reasons"
+    )
+
+
+def test_key_ring_from_files(
+    authenticate, tmp_path, get_access_token, get_protected
+):
+    shutil.copy(resources / "rsa-test-public.pem", tmp_path / "rsa.pem")
+    jwks = tmp_path / "keys.json"
+    jwks.write_text(
+        json.dumps(
+            {
+                "keys": [
+                    {"kty": "oct", "kid": "hmac", "k": "c2VjcmV0"},
+                ]
+            }
+        )
+    )
+
+    key_ring = KeyRing.from_files(
+        [tmp_path / "rsa.pem", jwks],
+        signing_kid="rsa",
+        private_key=resources / "rsa-test-key.pem",
+    )
+    assert set(key_ring.kids) == {"rsa", "hmac"}
+
+    sanic_app, sanic_jwt = create_app(
+        authenticate, key_ring, algorithm="RS256"
+    )
+    access_token = get_access_token(sanic_app, sanic_jwt)
+
+    assert jwt.get_unverified_header(access_token)["kid"] == "rsa"
+    assert get_protected(sanic_app, access_token).status == 200
+
+
+def test_key_ring_reload(tmp_path):
+    jwks = tmp_path / "keys.json"
+    jwks.write_text(json.dumps({"kty": "oct", "kid": "a", "k": "c2VjcmV0"}))
+    key_ring = KeyRing.from_files([jwks], signing_kid="a")
+
+    jwks.write_text(json.dumps({"kty": "oct", "kid": "b", "k": "c2VjcmV0"}))
+    with pytest.raises(exceptions.InvalidConfiguration):
+        key_ring.reload()
+    assert key_ring.kids == ("a",)
+
+    key_ring = KeyRing.from_files([jwks], signing_kid="b")
+    jwks.write_text("not json")
+    with pytest.raises(exceptions.InvalidConfiguration):
+        key_ring.reload()
+    assert key_ring.kids == ("b",)
+    assert key_ring.signing_key == ("b", b"secret")
+
+
+def test_key_ring_configuration():
+    with pytest.raises(exceptions.InvalidConfiguration):
+        KeyRing({"a": "secret"}, signing_kid="b")
+
+    with pytest.raises(exceptions.InvalidConfiguration):
+        KeyRing({"a": "secret"}, signing_key="secret")
+
+    with pytest.raises(exceptions.InvalidConfiguration):
+        KeyRing({"a": "secret"}).signing_key
+
+    with pytest.raises(exceptions.InvalidConfiguration):
+        KeyRing({"a": "secret"}).reload()
@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from sanic_jwt import exceptions
+
+
+@pytest.fixture
+def app_with_refresh_lookups(create_app):
+    def app_with_refresh_lookups(
+        retrieve_user, retrieve_refresh_token, **kwargs
+    ):
+        cache = {}
+
+        async def store_refresh_token(user_id, refresh_token, *args, **kwargs):
+            cache[user_id] = refresh_token
+
+        async def retrieve(request, user_id, *args, **kwargs):
+            await retrieve_refresh_token(user_id)
+            return cache.get(user_id)
+
+        return create_app(
+            store_refresh_token=store_refresh_token,
+            retrieve_refresh_token=retrieve,
+            retrieve_user=retrieve_user,
+            refresh_token_enabled=True,
+            **kwargs
+        )
+
+    yield app_with_refresh_lookups
+
+
+def _refresh(sanic_app, sanicjwt):
+    _, response = sanic_app.test_client.post(
+        "/auth", json={"username": "user1", "password": "abcxyz"}
+    )
+    access_token = response.json.get(sanicjwt.config.access_token_name())
+    refresh_token = response.json.get(sanicjwt.config.refresh_token_name())
+
+    _, response = sanic_app.test_client.post(
+        "/auth/refresh",
+        headers={"Authorization": "Bearer {}".format(access_token)},
+        json={sanicjwt.config.refresh_token_name(): refresh_token},
+    )
+    return response
+
+
+def test_lookups_run_concurrently(app_with_refresh_lookups):
+    running = set()
+    overlaps = []
+
+    async def lookup(name):
+        running.add(name)
+        await asyncio.sleep(0.05)
+        overlaps.append(set(running))
+        running.discard(name)
+
+    async def retrieve_user(request, payload, *args, **kwargs):
+        await lookup("user")
+        return {"user_id": payload.get("user_id"), "username": "user1"}
+
+    async def retrieve_refresh_token(user_id):
+        assert user_id == 1
+        await lookup("refresh_token")
+
+    sanic_app, sanicjwt = app_with_refresh_lookups(
+        retrieve_user, retrieve_refresh_token
+    )
+    response = _refresh(sanic_app, sanicjwt)
+
+    assert response.status == 200
+    assert response.json.get(sanicjwt.config.access_token_name())
+    assert {"user", "refresh_token"} in overlaps
+
+
+def test_skip_retrieve_user(app_with_refresh_lookups):
+    async def retrieve_user(request, payload, *args, **kwargs):
+        raise AssertionError("retrieve_user should not be called")
+
+    async def retrieve_refresh_token(user_id):
+        assert user_id == 1
+
+    sanic_app, sanicjwt = app_with_refresh_lookups(
+        retrieve_user,
+        retrieve_refresh_token,
+        refresh_token_retrieve_user=False,
+    )
+    response = _refresh(sanic_app, sanicjwt)
+
+    assert response.status == 200
+    access_token = response.json.get(sanicjwt.config.access_token_name())
+    payload = asyncio.run(
+        sanicjwt.instance.ctx.auth._decode(access_token, verify=False)
+    )
+    assert payload.get("user_id") == 1
+
+
+def test_failed_user_lookup_cancels_refresh_token_lookup(
+    app_with_refresh_lookups,
+):
+    cancelled = []
+
+    async def retrieve_user(request, payload, *args, **kwargs):
+        raise exceptions.AuthenticationFailed("User not found.")
+
+    async def retrieve_refresh_token(user_id):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(user_id)
+            raise
+
+    sanic_app, sanicjwt = app_with_refresh_lookups(
+        retrieve_user, retrieve_refresh_token
+    )
+    response = _refresh(sanic_app, sanicjwt)
+
+    assert response.status == 401
+    assert response.json.get("reasons") == ["User not found."]
+    assert cancelled == [1]
+
+
+@pytest.mark.parametrize("retrieve_user_enabled", [True, False])
+def test_wrong_refresh_token(
+    app_with_refresh_lookups, get_access_token, retrieve_user_enabled
+):
+    async def retrieve_user(request, payload, *args, **kwargs):
+        return {"user_id": payload.get("user_id")}
+
+    async def retrieve_refresh_token(user_id):
+        pass
+
+    sanic_app, sanicjwt = app_with_refresh_lookups(
+        retrieve_user,
+        retrieve_refresh_token,
+        refresh_token_retrieve_user=retrieve_user_enabled,
+    )
+
+    access_token = get_access_token(sanic_app, sanicjwt)
+
+    _, response = sanic_app.test_client.post(
+        "/auth/refresh",
+        headers={"Authorization": "Bearer {}".format(access_token)},
+        json={sanicjwt.config.refresh_token_name(): "not the refresh token"},
+    )
+
+    assert response.status == 401
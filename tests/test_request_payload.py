@@ -0,0 +1,90 @@
+import pytest
+from sanic import Sanic
+from sanic.response import json
+
+from sanic_jwt import Configuration, Initialize
+
+
+class DynamicSecretConfiguration(Configuration):
+    def get_secret(self, request=None):
+        return "a secret that is looked up for every request"
+
+
+# With a dynamic setting, the verification plan is built on every call
+@pytest.fixture(
+    params=[Configuration, DynamicSecretConfiguration],
+    ids=["static", "dynamic"],
+)
+def app_with_payload_routes(request, authenticate, retrieve_user):
+    async def add_scopes_to_payload(user):
+        return ["user:read"]
+
+    sanic_app = Sanic("sanic-jwt-test")
+    sanicjwt = Initialize(
+        sanic_app,
+        authenticate=authenticate,
+        retrieve_user=retrieve_user,
+        add_scopes_to_payload=add_scopes_to_payload,
+        configuration_class=request.param,
+    )
+
+    @sanic_app.route("/scoped")
+    @sanicjwt.scoped("user:read")
+    async def scoped_route(request):
+        return json({"payload": request.ctx.jwt_payload})
+
+    @sanic_app.route("/user")
+    @sanicjwt.inject_user()
+    @sanicjwt.protected()
+    async def user_route(request, user):
+        user_id = await request.app.ctx.auth.extract_user_id(request)
+        return json({"user_id": user.user_id, "extracted": user_id})
+
+    _, response = sanic_app.test_client.post(
+        "/auth", json={"username": "user1", "password": "abcxyz"}
+    )
+    access_token = response.json.get(sanicjwt.config.access_token_name())
+
+    yield sanic_app, access_token
+
+
+def test_scoped_decodes_once(app_with_payload_routes, decode_calls):
+    sanic_app, access_token = app_with_payload_routes
+
+    _, response = sanic_app.test_client.get(
+        "/scoped",
+        headers={"Authorization": "Bearer {}".format(access_token)},
+    )
+
+    assert response.status == 200
+    assert response.json.get("payload").get("user_id") == 1
+    assert response.json.get("payload").get("scopes") == ["user:read"]
+    assert decode_calls.count(access_token) == 1
+
+
+def test_inject_user_decodes_once(app_with_payload_routes, decode_calls):
+    sanic_app, access_token = app_with_payload_routes
+
+    _, response = sanic_app.test_client.get(
+        "/user",
+        headers={"Authorization": "Bearer {}".format(access_token)},
+    )
+
+    assert response.status == 200
+    assert response.json == {"user_id": 1, "extracted": 1}
+    assert decode_calls.count(access_token) == 1
+
+
+def test_payload_is_verified_after_unverified_decode(
+    app_with_payload_routes,
+):
+    sanic_app, access_token = app_with_payload_routes
+    sanic_app.ctx.auth._extra_verifications = [lambda payload: False]
+
+    _, response = sanic_app.test_client.get(
+        "/user",
+        headers={"Authorization": "Bearer {}".format(access_token)},
+    )
+
+    assert response.status == 401
+    assert "Verifications were not met." in response.json.get("reasons")
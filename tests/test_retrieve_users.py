@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from sanic_jwt import exceptions
+
+
+async def _extract_users(auth, user_ids):
+    return await asyncio.gather(
+        *(auth.extract_user(None, {"user_id": x}) for x in user_ids)
+    )
+
+
+def test_retrieve_users(create_app, userid_table):
+    calls = []
+
+    async def retrieve_users(user_ids):
+        calls.append(user_ids)
+        await asyncio.sleep(0)
+        return {x: userid_table.get(x) for x in user_ids}
+
+    _, sanic_jwt = create_app(retrieve_users=retrieve_users)
+    auth = sanic_jwt.instance.ctx.auth
+
+    users = asyncio.run(_extract_users(auth, [1, 2, 1, 2, 3]))
+
+    assert [getattr(user, "user_id", None) for user in users] == [
+        1,
+        2,
+        1,
+        2,
+        None,
+    ]
+    assert calls == [[1, 2, 3]]
+
+
+def test_retrieve_users_as_a_list(create_app, userid_table):
+    calls = []
+
+    def retrieve_users(user_ids):
+        calls.append(user_ids)
+        return [userid_table.get(x) for x in user_ids]
+
+    _, sanic_jwt = create_app(retrieve_users=retrieve_users)
+    auth = sanic_jwt.instance.ctx.auth
+
+    users = asyncio.run(_extract_users(auth, [2, 1, 2]))
+
+    assert [user.user_id for user in users] == [2, 1, 2]
+    assert calls == [[2, 1]]
+
+
+def test_retrieve_users_with_inject_user(
+    create_app, userid_table, get_access_token, get_protected
+):
+    calls = []
+
+    async def retrieve_users(user_ids):
+        calls.append(user_ids)
+        return {x: userid_table.get(x) for x in user_ids}
+
+    sanic_app, sanic_jwt = create_app(retrieve_users=retrieve_users)
+    access_token = get_access_token(sanic_app, sanic_jwt)
+
+    response = get_protected(sanic_app, access_token, "/protected/user")
+
+    assert response.status == 200
+    assert response.json.get("user_id") == 1
+    assert calls == [[1]]
+
+
+@pytest.mark.parametrize("batch_retrieve_user", [True, False])
+def test_batch_retrieve_user(create_app, retrieve_user, batch_retrieve_user):
+    calls = []
+
+    async def counting_retrieve_user(request, payload, *args, **kwargs):
+        calls.append(payload.get("user_id"))
+        await asyncio.sleep(0)
+        return await retrieve_user(request, payload)
+
+    _, sanic_jwt = create_app(
+        retrieve_user=counting_retrieve_user,
+        batch_retrieve_user=batch_retrieve_user,
+    )
+    auth = sanic_jwt.instance.ctx.auth
+
+    users = asyncio.run(_extract_users(auth, [1, 1, 1, 2, 2]))
+
+    assert [user.user_id for user in users] == [1, 1, 1, 2, 2]
+    if batch_retrieve_user:
+        assert calls == [1, 2]
+    else:
+        assert calls == [1, 1, 1, 2, 2]
+
+
+def test_retrieve_users_failure(create_app, userid_table):
+    calls = []
+
+    async def retrieve_users(user_ids):
+        calls.append(user_ids)
+        if len(calls) == 1:
+            raise exceptions.AuthenticationFailed("Database is down.")
+        return {x: userid_table.get(x) for x in user_ids}
+
+    _, sanic_jwt = create_app(retrieve_users=retrieve_users)
+    auth = sanic_jwt.instance.ctx.auth
+
+    async def run():
+        results = await asyncio.gather(
+            auth.extract_user(None, {"user_id": 1}),
+            auth.extract_user(None, {"user_id": 2}),
+            return_exceptions=True,
+        )
+        # Failures are not remembered
+        user = await auth.extract_user(None, {"user_id": 1})
+        return results, user
+
+    results, user = asyncio.run(run())
+
+    assert all(isinstance(x, exceptions.AuthenticationFailed) for x in results)
+    assert user.user_id == 1
+    assert calls == [[1, 2], [1]]
+
+
+def test_cancelled_request_does_not_cancel_others(create_app, userid_table):
+    async def retrieve_users(user_ids):
+        await asyncio.sleep(0.01)
+        return {x: userid_table.get(x) for x in user_ids}
+
+    _, sanic_jwt = create_app(retrieve_users=retrieve_users)
+    auth = sanic_jwt.instance.ctx.auth
+
+    async def run():
+        cancelled = asyncio.ensure_future(
+            auth.extract_user(None, {"user_id": 1})
+        )
+        waiting = asyncio.ensure_future(
+            auth.extract_user(None, {"user_id": 1})
+        )
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        return await waiting
+
+    assert asyncio.run(run()).user_id == 1
@@ -0,0 +1,201 @@
+import asyncio
+import json as jsonlib
+from datetime import datetime, timedelta
+
+import pytest
+from freezegun import freeze_time
+from sanic import Sanic
+from sanic.response import json
+
+from sanic_jwt import exceptions, Initialize, protected, RevocationList
+from sanic_jwt.utils import ParsedToken
+
+
+@pytest.fixture
+def app_with_revocation(authenticate):
+    revocation_list = RevocationList()
+
+    sanic_app = Sanic("sanic-jwt-test")
+    sanic_jwt = Initialize(
+        sanic_app,
+        authenticate=authenticate,
+        claim_jti=True,
+        revocation_list=revocation_list,
+        token_cache_size=10,
+    )
+
+    @sanic_app.route("/protected")
+    @protected()
+    async def protected_request(request):
+        return json({"protected": True})
+
+    @sanic_app.route("/logout", methods=["POST"])
+    @protected()
+    async def logout(request):
+        sanic_jwt.instance.ctx.auth.revoke_token(request.ctx.jwt_payload)
+        return json({"revoked": True})
+
+    yield sanic_app, sanic_jwt, revocation_list
+
+
+def test_jti_claim(app_with_revocation, get_access_token):
+    sanic_app, sanic_jwt, _ = app_with_revocation
+
+    first = ParsedToken(get_access_token(sanic_app, sanic_jwt)).payload
+    second = ParsedToken(get_access_token(sanic_app, sanic_jwt)).payload
+
+    assert first["jti"]
+    assert first["jti"] != second["jti"]
+
+
+def test_jti_claim_disabled_by_default(app, get_access_token):
+    sanic_app, sanic_jwt = app
+
+    payload = ParsedToken(get_access_token(sanic_app, sanic_jwt)).payload
+
+    assert "jti" not in payload
+
+
+def test_jti_claim_is_unique_in_a_batch(app_with_revocation):
+    _, sanic_jwt, _ = app_with_revocation
+    auth = sanic_jwt.instance.ctx.auth
+
+    tokens = asyncio.run(
+        auth.generate_access_tokens([{"user_id": 1}, {"user_id": 1}])
+    )
+
+    jtis = {ParsedToken(token).payload["jti"] for token in tokens}
+    assert len(jtis) == 2
+
+
+def test_revoke_token(app_with_revocation, get_access_token, get_protected):
+    sanic_app, sanic_jwt, revocation_list = app_with_revocation
+    revoked = get_access_token(sanic_app, sanic_jwt)
+    other = get_access_token(sanic_app, sanic_jwt)
+
+    # Verified once, so that the payload is in the token cache
+    assert get_protected(sanic_app, revoked).status == 200
+
+    sanic_jwt.instance.ctx.auth.revoke_token(revoked)
+
+    assert ParsedToken(revoked).payload["jti"] in revocation_list
+    response = get_protected(sanic_app, revoked)
+    assert response.status == 401
+    assert response.json.get("reasons") == ["Token has been revoked."]
+
+    assert get_protected(sanic_app, other).status == 200
+
+    _, response = sanic_app.test_client.get(
+        "/auth/verify",
+        headers={"Authorization": "Bearer {}".format(revoked)},
+    )
+    assert response.status == 401
+    assert response.json.get("valid") is False
+
+
+def test_revoke_payload(app_with_revocation, get_access_token, get_protected):
+    sanic_app, sanic_jwt, revocation_list = app_with_revocation
+    access_token = get_access_token(sanic_app, sanic_jwt)
+
+    _, response = sanic_app.test_client.post(
+        "/logout",
+        headers={"Authorization": "Bearer {}".format(access_token)},
+    )
+    assert response.status == 200
+
+    assert get_protected(sanic_app, access_token).status == 401
+
+
+def test_revoked_tokens_in_batch(app_with_revocation, get_access_token):
+    sanic_app, sanic_jwt, _ = app_with_revocation
+    auth = sanic_jwt.instance.ctx.auth
+    revoked = get_access_token(sanic_app, sanic_jwt)
+    other = get_access_token(sanic_app, sanic_jwt)
+    auth.revoke_token(revoked)
+
+    results = asyncio.run(auth.verify_tokens([revoked, other]))
+
+    assert results[0].valid is False
+    assert results[0].reasons == ["Token has been revoked."]
+    assert results[1].valid is True
+
+
+def test_revoke_token_without_jti(app, get_access_token):
+    sanic_app, sanic_jwt = app
+    token = get_access_token(sanic_app, sanic_jwt)
+
+    with pytest.raises(exceptions.InvalidConfiguration):
+        sanic_jwt.instance.ctx.auth.revoke_token(token)
+
+    with sanic_jwt.instance.ctx.auth.override(
+        revocation_list=RevocationList()
+    ):
+        with pytest.raises(exceptions.InvalidToken):
+            sanic_jwt.instance.ctx.auth.revoke_token(token)
+
+
+def test_revocation_expires():
+    revocation_list = RevocationList()
+    now = datetime.utcnow()
+
+    revocation_list.revoke("forever")
+    revocation_list.revoke("short", now + timedelta(seconds=10))
+    revocation_list.revoke("long", now + timedelta(seconds=100))
+
+    assert "short" in revocation_list
+    assert "unknown" not in revocation_list
+    assert len(revocation_list) == 3
+
+    with freeze_time(now + timedelta(seconds=20)):
+        assert "short" not in revocation_list
+        assert "long" in revocation_list
+
+        revocation_list.purge()
+        assert len(revocation_list) == 2
+
+        # Revoked again, for longer
+        revocation_list.revoke("long", now + timedelta(seconds=200))
+
+    with freeze_time(now + timedelta(seconds=150)):
+        revocation_list.purge()
+        assert "long" in revocation_list
+        assert "forever" in revocation_list
+
+    revocation_list.unrevoke("forever")
+    assert "forever" not in revocation_list
+
+
+def test_revocation_snapshot(tmp_path):
+    path = tmp_path / "revoked.json"
+    now = datetime.utcnow()
+
+    revocation_list = RevocationList()
+    revocation_list.revoke("forever")
+    revocation_list.revoke("short", now + timedelta(seconds=10))
+    revocation_list.revoke("long", now + timedelta(seconds=100))
+    revocation_list.save(path)
+
+    assert not (tmp_path / "revoked.json.tmp").exists()
+    assert set(jsonlib.loads(path.read_text())["revoked"]) == {
+        "forever",
+        "short",
+        "long",
+    }
+
+    with freeze_time(now + timedelta(seconds=20)):
+        loaded = RevocationList.from_file(path)
+
+    assert len(loaded) == 2
+    assert "forever" in loaded
+    assert "long" in loaded
+
+
+def test_invalid_revocation_snapshot(tmp_path):
+    path = tmp_path / "revoked.json"
+    path.write_text("[]")
+
+    with pytest.raises(exceptions.InvalidConfiguration):
+        RevocationList.from_file(path)
+
+    with pytest.raises(exceptions.ProvidedPathNotFound):
+        RevocationList.from_file(tmp_path / "missing.json")
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+import pytest
+from freezegun import freeze_time
+from sanic import Sanic
+from sanic.response import json
+
+from sanic_jwt import Initialize, protected
+
+
+@pytest.fixture
+def app_with_token_cache(authenticate):
+    verifications = {"enabled": True}
+
+    sanic_app = Sanic("sanic-jwt-test")
+    sanic_jwt = Initialize(
+        sanic_app,
+        authenticate=authenticate,
+        token_cache_size=2,
+        extra_verifications=[lambda payload: verifications["enabled"]],
+    )
+
+    @sanic_app.route("/protected")
+    @protected()
+    async def protected_request(request):
+        return json({"protected": True})
+
+    yield sanic_app, sanic_jwt, verifications
+
+
+def test_token_cache_disabled_by_default(app):
+    _, sanic_jwt = app
+
+    assert sanic_jwt.instance.ctx.auth._token_cache is None
+
+
+def test_token_cache_skips_decode(
+    app_with_token_cache, decode_calls, get_access_token, get_protected
+):
+    sanic_app, sanic_jwt, _ = app_with_token_cache
+    access_token = get_access_token(sanic_app, sanic_jwt)
+
+    for _ in range(3):
+        assert get_protected(sanic_app, access_token).status == 200
+
+    assert decode_calls.count(access_token) == 1
+
+
+def test_token_cache_still_runs_verifications(
+    app_with_token_cache, get_access_token, get_protected
+):
+    sanic_app, sanic_jwt, verifications = app_with_token_cache
+    access_token = get_access_token(sanic_app, sanic_jwt)
+
+    assert get_protected(sanic_app, access_token).status == 200
+
+    verifications["enabled"] = False
+    response = get_protected(sanic_app, access_token)
+    assert response.status == 401
+    assert "Verifications were not met." in response.json.get("reasons")
+
+
+def test_token_cache_respects_expiration(
+    app_with_token_cache, get_access_token, get_protected
+):
+    sanic_app, sanic_jwt, _ = app_with_token_cache
+    access_token = get_access_token(sanic_app, sanic_jwt)
+
+    assert get_protected(sanic_app, access_token).status == 200
+
+    with freeze_time(datetime.utcnow() + timedelta(seconds=(60 * 35))):
+        response = get_protected(sanic_app, access_token)
+
+    assert response.status == 401
+    assert "Signature has expired." in response.json.get("reasons")
+
+
+def test_token_cache_is_bounded(
+    app_with_token_cache, decode_calls, get_access_token, get_protected
+):
+    sanic_app, sanic_jwt, _ = app_with_token_cache
+    cache = sanic_jwt.instance.ctx.auth._token_cache
+    tokens = [
+        get_access_token(sanic_app, sanic_jwt, username)
+        for username in ("user1", "user2", "user1")
+    ]
+
+    for access_token in tokens:
+        assert get_protected(sanic_app, access_token).status == 200
+
+    assert len(cache) == 2
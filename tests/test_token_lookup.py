@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import pytest
+
+from sanic_jwt import exceptions
+
+
+def make_request(headers=None, cookies=None, args=None):
+    return SimpleNamespace(
+        headers=headers or {}, cookies=cookies or {}, args=args or {}
+    )
+
+
+def test_token_lookup_is_reused(app):
+    _, sanic_jwt = app
+    auth = sanic_jwt.instance.ctx.auth
+
+    lookup = auth._get_token_lookup()
+
+    assert lookup is auth._get_token_lookup()
+    assert lookup.header == "authorization"
+    assert lookup.header_prefix == "Bearer "
+    assert lookup.cookie_set is False
+    assert lookup.cookie_split_signature_name is None
+
+
+def test_token_lookup_rebuilt_on_update(app):
+    _, sanic_jwt = app
+    auth = sanic_jwt.instance.ctx.auth
+
+    lookup = auth._get_token_lookup()
+    sanic_jwt.config.authorization_header_prefix.update("JWT")
+
+    assert auth._get_token_lookup() is not lookup
+    assert (
+        auth._get_token(make_request(headers={"authorization": "JWT abc"}))
+        == "abc"
+    )
+
+
+@pytest.mark.parametrize(
+    "header", ["Bearer", "Bearer  abc", "Bearer a b", "Token abc", "abc"]
+)
+def test_invalid_authorization_header(app, header):
+    _, sanic_jwt = app
+    auth = sanic_jwt.instance.ctx.auth
+
+    with pytest.raises(exceptions.InvalidAuthorizationHeader):
+        auth._get_token(make_request(headers={"authorization": header}))
+
+
+def test_empty_token_in_header(app):
+    _, sanic_jwt = app
+    auth = sanic_jwt.instance.ctx.auth
+
+    with pytest.raises(exceptions.MissingAuthorizationHeader):
+        auth._get_token(make_request(headers={"authorization": "Bearer "}))
+
+
+def test_token_lookup_with_override(app):
+    _, sanic_jwt = app
+    auth = sanic_jwt.instance.ctx.auth
+    request = make_request(
+        headers={"authorization": "Bearer fromheader"},
+        cookies={"access_token": "fromcookie"},
+    )
+
+    with auth.override(cookie_set=True):
+        assert auth._get_token(request) == "fromcookie"
+
+    assert auth._get_token(request) == "fromheader"
+
+
+def test_split_cookie_lookup(app):
+    _, sanic_jwt = app
+    auth = sanic_jwt.instance.ctx.auth
+    request = make_request(
+        cookies={
+            "access_token": "header.payload",
+            "access_token_signature": "sig",
+        }
+    )
+
+    with auth.override(cookie_set=True, cookie_split=True):
+        assert auth._get_token(request) == "header.payload.sig"
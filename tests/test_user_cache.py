@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+from sanic.response import json
+
+from sanic_jwt import inject_user, protected
+
+
+@pytest.fixture
+def retrieve_user_calls(retrieve_user):
+    calls = []
+
+    async def counting_retrieve_user(request, payload, *args, **kwargs):
+        calls.append(payload.get("user_id"))
+        return await retrieve_user(request, payload, *args, **kwargs)
+
+    yield counting_retrieve_user, calls
+
+
+def test_user_retrieved_once_per_request(
+    create_app, retrieve_user_calls, get_access_token, get_protected
+):
+    retrieve_user, calls = retrieve_user_calls
+    sanic_app, sanic_jwt = create_app(retrieve_user=retrieve_user)
+
+    @sanic_app.route("/protected/user/again")
+    @inject_user()
+    @protected()
+    async def protected_user_again(request, user):
+        again = await request.app.ctx.auth.extract_user(request)
+        assert again is user
+        return json({"user_id": user.user_id})
+
+    access_token = get_access_token(sanic_app, sanic_jwt)
+
+    response = get_protected(sanic_app, access_token, "/protected/user/again")
+    assert response.status == 200
+    assert response.json.get("user_id") == 1
+    assert calls == [1]
+
+    # Without the cache, every request retrieves the user again
+    for path in ("/protected/user/again", "/auth/me"):
+        assert get_protected(sanic_app, access_token, path).status == 200
+    assert calls == [1, 1, 1]
+
+
+def test_user_cache(
+    create_app, retrieve_user_calls, get_access_token, get_protected
+):
+    retrieve_user, calls = retrieve_user_calls
+    sanic_app, sanic_jwt = create_app(
+        retrieve_user=retrieve_user, user_cache_size=10, claim_iat=True
+    )
+    access_token = get_access_token(sanic_app, sanic_jwt)
+    path = "/protected/user"
+
+    assert get_protected(sanic_app, access_token, path).status == 200
+    response = get_protected(sanic_app, access_token, "/auth/me")
+    assert response.status == 200
+    assert response.json.get("me").get("user_id") == 1
+    assert calls == [1]
+
+    sanic_jwt.instance.ctx.auth.invalidate_user(1)
+    assert get_protected(sanic_app, access_token, path).status == 200
+    assert calls == [1, 1]
+
+
+def test_user_cache_is_keyed_by_token(create_app, retrieve_user_calls):
+    retrieve_user, calls = retrieve_user_calls
+    _, sanic_jwt = create_app(retrieve_user=retrieve_user, user_cache_size=10)
+    auth = sanic_jwt.instance.ctx.auth
+
+    async def retrieve():
+        first = {"user_id": 1, "iat": 100}
+        second = {"user_id": 1, "iat": 200}
+        unknown = {"user_id": 5, "iat": 100}
+        return [
+            await auth.extract_user(None, payload)
+            for payload in (first, second, first, second, unknown, unknown)
+        ]
+
+    users = asyncio.run(retrieve())
+
+    assert [user.user_id for user in users[:4]] == [1, 1, 1, 1]
+    # Users that are not found are not cached
+    assert users[4:] == [None, None]
+    assert calls == [1, 1, 5, 5]
@@ -1,7 +1,12 @@
+import asyncio
+
+import jwt
 import pytest
 from sanic import Sanic
+from sanic.response import json
 
-from sanic_jwt import exceptions, Initialize
+from sanic_jwt import exceptions, Initialize, protected
+from sanic_jwt.utils import ParsedToken
 
 
 def test_secret_not_enabled():
@@ -36,3 +41,198 @@ async def test_user_secret(app_with_user_secrets):
 
     assert response.status == 200
     assert response.json.get("protected") is True
+
+
+@pytest.mark.asyncio
+async def test_user_secret_decodes_token_once(
+    app_with_user_secrets, monkeypatch
+):
+    app, sanicjwt = app_with_user_secrets
+    calls = []
+    decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(kwargs.get("options"))
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt, "decode", counting_decode)
+
+    _, response = await app.asgi_client.post(
+        "/auth", json={"username": "user1", "password": "abcxyz"}
+    )
+    access_token = response.json.get(sanicjwt.config.access_token_name(), None)
+
+    _, response = await app.asgi_client.get(
+        "/protected",
+        headers={"Authorization": "Bearer {}".format(access_token)},
+    )
+
+    assert response.status == 200
+    assert len(calls) == 1
+    assert calls[0].get("verify_signature", True)
+
+
+@pytest.mark.asyncio
+async def test_user_secret_shares_parsed_token(
+    app_with_user_secrets, monkeypatch
+):
+    app, _ = app_with_user_secrets
+    auth = app.ctx.auth
+    tokens = []
+    get_secret = auth._get_secret
+
+    async def recording_get_secret(token=None, **kwargs):
+        tokens.append(token)
+        return await get_secret(token=token, **kwargs)
+
+    access_token = await auth.generate_access_token({"user_id": 1})
+    monkeypatch.setattr(auth, "_get_secret", recording_get_secret)
+    payload = await auth._decode(access_token)
+
+    assert payload["user_id"] == 1
+    assert isinstance(tokens[0], ParsedToken)
+    # The payload read for the user secret lookup is kept on the token
+    assert tokens[0]._payload == {"user_id": 1, "exp": payload["exp"]}
+
+
+@pytest.mark.asyncio
+async def test_token_not_parsed_without_user_secrets(app, monkeypatch):
+    sanic_app, _ = app
+    auth = sanic_app.ctx.auth
+    access_token = await auth.generate_access_token({"user_id": 1})
+
+    def fail(token):
+        pytest.fail("Parsed a token that nothing reads")
+
+    monkeypatch.setattr("sanic_jwt.utils.ParsedToken", fail)
+
+    assert (await auth._decode(access_token))["user_id"] == 1
+
+
+@pytest.mark.asyncio
+async def test_user_secret_with_malformed_token(app_with_user_secrets):
+    app, _ = app_with_user_secrets
+
+    for token in ("abc", "abc.def.ghi", "e30.W10.abc"):
+        _, response = await app.asgi_client.get(
+            "/protected", headers={"Authorization": "Bearer " + token}
+        )
+
+        assert response.status == 401
+
+
+def test_parsed_token():
+    token = jwt.encode({"user_id": 1}, "secret", algorithm="HS256")
+    parsed = ParsedToken(token)
+
+    assert parsed.payload == {"user_id": 1}
+    assert parsed.payload is parsed.payload
+    assert parsed.header == {"alg": "HS256", "typ": "JWT"}
+    assert parsed.signing_input + "." + parsed.signature == token
+
+    with pytest.raises(jwt.exceptions.DecodeError):
+        ParsedToken("abc").payload
+
+    with pytest.raises(jwt.exceptions.DecodeError):
+        ParsedToken("e30.W10.abc").payload
+
+
+@pytest.fixture
+def app_with_user_secret_cache(authenticate):
+    secrets = {1: "foobar<1>"}
+    calls = []
+
+    async def retrieve_user_secret(user_id, **kwargs):
+        calls.append(user_id)
+        secret = secrets[user_id]
+        await asyncio.sleep(0)
+        return secret
+
+    sanic_app = Sanic("sanic-jwt-test")
+    sanic_jwt = Initialize(
+        sanic_app,
+        authenticate=authenticate,
+        user_secret_enabled=True,
+        retrieve_user_secret=retrieve_user_secret,
+        user_secret_cache_size=10,
+    )
+
+    @sanic_app.route("/protected")
+    @protected()
+    async def protected_request(request):
+        return json({"protected": True})
+
+    yield sanic_app, sanic_jwt, secrets, calls
+
+
+@pytest.mark.asyncio
+async def test_user_secret_cache(app_with_user_secret_cache):
+    app, sanicjwt, secrets, calls = app_with_user_secret_cache
+    auth = app.ctx.auth
+
+    _, response = await app.asgi_client.post(
+        "/auth", json={"username": "user1", "password": "abcxyz"}
+    )
+    access_token = response.json.get(sanicjwt.config.access_token_name(), None)
+
+    for _ in range(3):
+        _, response = await app.asgi_client.get(
+            "/protected",
+            headers={"Authorization": "Bearer {}".format(access_token)},
+        )
+        assert response.status == 200
+
+    assert calls == [1]
+
+    secrets[1] = "rotated<1>"
+    auth.invalidate_user_secret(1)
+
+    _, response = await app.asgi_client.get(
+        "/protected",
+        headers={"Authorization": "Bearer {}".format(access_token)},
+    )
+
+    assert response.status == 401
+    assert calls == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_user_secret_cache_coalesces_misses(app_with_user_secret_cache):
+    app, _, _, calls = app_with_user_secret_cache
+    auth = app.ctx.auth
+
+    secrets = await asyncio.gather(
+        *(auth._retrieve_user_secret(1) for _ in range(5))
+    )
+
+    assert secrets == ["foobar<1>"] * 5
+    assert calls == [1]
+    assert not auth._user_secret_pending
+
+
+@pytest.mark.asyncio
+async def test_user_secret_invalidated_while_in_flight(
+    app_with_user_secret_cache,
+):
+    app, _, secrets, calls = app_with_user_secret_cache
+    auth = app.ctx.auth
+
+    pending = asyncio.ensure_future(auth._retrieve_user_secret(1))
+    while not calls:
+        await asyncio.sleep(0)
+    auth.invalidate_user_secret(1)
+    secrets[1] = "rotated<1>"
+
+    assert await pending == "foobar<1>"
+    assert await auth._retrieve_user_secret(1) == "rotated<1>"
+    assert calls == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_user_secret_cache_disabled(app_with_user_secrets):
+    app, _ = app_with_user_secrets
+    auth = app.ctx.auth
+
+    assert auth._user_secret_cache is None
+    assert await auth._retrieve_user_secret(1) == "foobar<1>"
+    auth.invalidate_user_secret(1)
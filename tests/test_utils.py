@@ -31,6 +31,22 @@ async def test_call():
     assert await utils.call(async_func) == 3
 
 
+@pytest.mark.asyncio
+async def test_adapt():
+    def sync_func(a, b, c=0):
+        return a + b + c
+
+    async def async_func(a=1, b=2, c=0):
+        return a + b + c
+
+    assert utils.adapt(async_func) is async_func
+    assert await utils.adapt(None)() is None
+    assert await utils.adapt("hello")(1, 2) == "hello"
+    assert await utils.adapt(sync_func)(1, 1) == 2
+    assert await utils.adapt(sync_func)(a=0, b=2, c=1) == 3
+    assert await utils.adapt(async_func)(1, 2, 3) == 6
+
+
 def test_load_file_or_str_with_Path(fcontent):
     p = Path(__file__).parent / "resources" / "test-file.txt"
     assert utils.load_file_or_str(str(p)) == fcontent
@@ -46,3 +62,15 @@ def test_load_file_or_str_with_str(fcontent):
         path.dirname(str(path.abspath(__file__))), "resources", "test-file.txt"
     )
     assert utils.load_file_or_str(p) == fcontent
+
+
+def test_prepare_key():
+    here = Path(__file__).parent
+    public_key = (here / "resources" / "rsa-test-public.pem").read_text()
+
+    key = utils.prepare_key(public_key, "RS256")
+
+    assert not isinstance(key, str)
+    assert utils.prepare_key(public_key, "RS256") is key
+    assert utils.prepare_key(key, "RS256") is key
+    assert utils.prepare_key("secret", "HS256") == "secret"
@@ -1,4 +1,16 @@
-from sanic_jwt.validators import validate_single_scope
+from itertools import product
+from types import SimpleNamespace
+
+import pytest
+
+from sanic_jwt.validators import (
+    compile_scopes,
+    get_scope_index,
+    normalize,
+    ScopeIndex,
+    validate_scopes,
+    validate_single_scope,
+)
 
 
 def test_validate_single_scope():
@@ -22,3 +34,116 @@ def test_validate_single_scope():
     assert validate_single_scope("user", []) is False
     assert validate_single_scope("user", [None]) is False
     assert validate_single_scope("user", [None, "user"])
+
+
+def _reference_validate_single_scope(
+    required, user_scopes, require_all_actions
+):
+    # The original list based matching, kept to check the compiled matcher
+    if not user_scopes or user_scopes.count(None) == len(user_scopes):
+        return False
+
+    user_scopes = [normalize(x) for x in user_scopes if x is not None]
+    rns, racts = normalize(required)
+
+    method = all if require_all_actions else any
+    for uns, uacts in user_scopes:
+        if rns and rns != uns:
+            continue
+        if racts:
+            if not uacts or method(x in uacts for x in racts):
+                return True
+        elif not uacts:
+            return True
+
+    return False
+
+
+def test_compiled_matcher_matches_reference():
+    scopes = [
+        "user",
+        "user:read",
+        "user:write",
+        "user:read:write",
+        "user:",
+        ":read",
+        ":write",
+        "",
+        ":",
+        "admin",
+        "admin:read",
+    ]
+    for required, a, b, require_all_actions in product(
+        scopes, scopes, scopes + [None], (True, False)
+    ):
+        user_scopes = [a, b]
+        assert validate_single_scope(
+            required, user_scopes, require_all_actions
+        ) == _reference_validate_single_scope(
+            required, user_scopes, require_all_actions
+        ), (
+            required,
+            user_scopes,
+            require_all_actions,
+        )
+
+
+def test_override_receives_normalized_scopes():
+    calls = []
+
+    def override(is_valid, required, user_scopes, require_all_actions):
+        calls.append((is_valid, required, user_scopes, require_all_actions))
+        return not is_valid
+
+    assert validate_single_scope(
+        "user:read", [None, "user:write"], override=override
+    )
+    assert calls == [(False, ("user", ["read"]), [("user", ["write"])], True)]
+
+
+def test_compile_scopes_is_cached():
+    assert compile_scopes(["user", "admin:read"]) is compile_scopes(
+        ("user", "admin:read")
+    )
+    assert compile_scopes("user") is compile_scopes(["user"])
+
+
+@pytest.mark.asyncio
+async def test_validate_scopes_with_index():
+    index = ScopeIndex(["user:read", "admin"])
+
+    async def validate(scopes, **kwargs):
+        return await validate_scopes(
+            None,
+            scopes,
+            index,
+            override=None,
+            destructure=lambda scopes: scopes,
+            **kwargs
+        )
+
+    assert await validate(["user:read", "admin:write"])
+    assert await validate(["user:write", "admin"]) is False
+    assert await validate(["user:write", "admin"], require_all=False)
+    assert await validate("user:read:write") is False
+    assert await validate("user:read:write", require_all_actions=False)
+
+
+@pytest.mark.asyncio
+async def test_scope_index_is_built_once_per_request():
+    request = SimpleNamespace(ctx=SimpleNamespace())
+    user_scopes = ["user:read", "admin"]
+
+    for scopes in ("user", "user:read", "admin:write"):
+        await validate_scopes(
+            request,
+            scopes,
+            user_scopes,
+            override=None,
+            destructure=lambda scopes: scopes,
+        )
+        if scopes == "user":
+            index = get_scope_index(request, user_scopes)
+
+    assert get_scope_index(request, user_scopes) is index
+    assert get_scope_index(request, ["user"]) is not index
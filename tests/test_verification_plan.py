@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+
+from freezegun import freeze_time
+from sanic import Sanic
+from sanic.response import json
+
+from sanic_jwt import Configuration, Initialize, protected
+
+
+def test_verification_plan_is_reused(app):
+    _, sanic_jwt = app
+    auth = sanic_jwt.instance.ctx.auth
+
+    plan = auth._get_verification_plan()
+
+    assert plan is auth._get_verification_plan()
+    assert plan.algorithms == ["HS256"]
+    assert plan.options == {"verify_exp": True}
+    assert plan.leeway == 180
+
+
+def test_verification_plan_rebuilt_on_update(app):
+    _, sanic_jwt = app
+    auth = sanic_jwt.instance.ctx.auth
+
+    plan = auth._get_verification_plan()
+    sanic_jwt.config.leeway.update(10)
+
+    assert auth._get_verification_plan() is not plan
+    assert auth._get_verification_plan().leeway == 10
+
+
+def test_verification_plan_with_override(app):
+    _, sanic_jwt = app
+    auth = sanic_jwt.instance.ctx.auth
+
+    with auth.override(verify_exp=False, claim_iss="issuer"):
+        plan = auth._get_verification_plan()
+        assert plan.options == {"verify_exp": False}
+        assert plan.issuer == "issuer"
+
+    plan = auth._get_verification_plan()
+    assert plan.options == {"verify_exp": True}
+    assert plan.issuer is None
+
+
+def test_verification_plan_with_instant_override(app):
+    _, sanic_jwt = app
+    auth = sanic_jwt.instance.ctx.auth
+    plan = auth._get_verification_plan()
+
+    sanic_jwt.config._push_instant_overrides(["verify_exp"])
+    assert auth._get_verification_plan() is not plan
+
+    sanic_jwt.config._pop_instant_overrides(["verify_exp"])
+    assert auth._get_verification_plan() is plan
+
+
+def test_verification_plan_not_compiled_for_getters(authenticate):
+    class MyConfig(Configuration):
+        def get_leeway(self, request):
+            return 10
+
+    sanic_app = Sanic("sanic-jwt-test")
+    sanic_jwt = Initialize(
+        sanic_app, authenticate=authenticate, configuration_class=MyConfig
+    )
+    auth = sanic_jwt.instance.ctx.auth
+
+    assert auth._get_verification_plan() is not (auth._get_verification_plan())
+
+
+def test_expired_token_after_override(authenticate):
+    sanic_app = Sanic("sanic-jwt-test")
+    sanic_jwt = Initialize(sanic_app, authenticate=authenticate)
+
+    @sanic_app.route("/protected")
+    @protected()
+    async def protected_request(request):
+        return json({"protected": True})
+
+    @sanic_app.route("/lenient")
+    @protected(verify_exp=False)
+    async def lenient_request(request):
+        return json({"protected": True})
+
+    with freeze_time(datetime.utcnow() - timedelta(hours=1)):
+        _, response = sanic_app.test_client.post(
+            "/auth", json={"username": "user1", "password": "abcxyz"}
+        )
+    access_token = response.json.get(sanic_jwt.config.access_token_name())
+    headers = {"Authorization": "Bearer {}".format(access_token)}
+
+    _, response = sanic_app.test_client.get("/protected", headers=headers)
+    assert response.status == 401
+
+    sanic_jwt.config.claim_iss.update(None)
+
+    _, response = sanic_app.test_client.get("/lenient", headers=headers)
+    assert response.status == 200
+
+    _, response = sanic_app.test_client.get("/protected", headers=headers)
+    assert response.status == 401
@@ -0,0 +1,194 @@
+import json
+from datetime import datetime, timedelta
+
+import jwt
+import pytest
+from freezegun import freeze_time
+from sanic import Sanic
+
+from sanic_jwt import Claim, exceptions, Initialize, Responses
+
+
+@pytest.fixture
+def app_with_verify_batch(app):
+    sanic_app, sanic_jwt = app
+    sanic_jwt.config.verify_batch_enabled.update(True)
+    yield sanic_app, sanic_jwt
+
+
+@pytest.mark.asyncio
+async def test_verify_tokens(app):
+    sanic_app, sanic_jwt = app
+    auth = sanic_app.ctx.auth
+    valid = await auth.generate_access_token({"user_id": 1})
+    with freeze_time(datetime.utcnow() - timedelta(hours=1)):
+        expired = await auth.generate_access_token({"user_id": 2})
+    forged = jwt.encode({"user_id": 3}, "not the secret")
+
+    results = await auth.verify_tokens([valid, expired, forged, "abc", 123])
+
+    assert [result.valid for result in results] == [
+        True,
+        False,
+        False,
+        False,
+        False,
+    ]
+    assert results[0].payload["user_id"] == 1
+    assert results[0].reasons is None
+    assert results[1].payload is None
+    assert results[1].reasons == ["Signature has expired."]
+    assert results[2].reasons == ["Auth required."]
+    assert results[4].reasons == ["Auth required."]
+
+
+@pytest.mark.asyncio
+async def test_verify_tokens_mixed_batch(app):
+    sanic_app, sanic_jwt = app
+    auth = sanic_app.ctx.auth
+    valid = await auth.generate_access_token({"user_id": 1})
+    other_algorithm = jwt.encode(
+        {"user_id": 2}, sanic_jwt.config.secret(), algorithm="HS512"
+    )
+
+    results = await auth.verify_tokens([valid, other_algorithm])
+
+    assert [result.valid for result in results] == [True, False]
+    assert results[1].reasons == ["The specified alg value is not allowed."]
+
+    with auth.override(claim_aud="clients"):
+        audience = jwt.encode(
+            {"user_id": 3, "aud": "clients"}, sanic_jwt.config.secret()
+        )
+        results = await auth.verify_tokens([audience, valid])
+
+    assert [result.valid for result in results] == [True, False]
+    assert results[1].reasons == ['Token is missing the "aud" claim.']
+
+
+def test_verify_endpoint_batch(app_with_verify_batch, get_access_token):
+    sanic_app, sanic_jwt = app_with_verify_batch
+    access_token = get_access_token(sanic_app, sanic_jwt)
+    tokens = [access_token, "abc"] * 120
+
+    _, response = sanic_app.test_client.post("/auth/verify", json=tokens)
+
+    assert response.status == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 240
+    assert lines[0]["valid"] is True
+    assert lines[0]["payload"]["user_id"] == 1
+    assert lines[1] == {
+        "valid": False,
+        "reasons": ["Auth required."],
+        "exception": "InvalidToken",
+    }
+
+
+def test_verify_endpoint_batch_disabled(app, get_access_token):
+    sanic_app, sanic_jwt = app
+    access_token = get_access_token(sanic_app, sanic_jwt)
+
+    _, response = sanic_app.test_client.post(
+        "/auth/verify", json=[access_token]
+    )
+
+    assert response.status == 405
+
+
+def test_verify_endpoint_batch_extended(authenticate, get_access_token):
+    class MyResponses(Responses):
+        @staticmethod
+        def extend_verify(request, user=None, payload=None):
+            return {"service": "tokens"}
+
+    sanic_app = Sanic("sanic-jwt-test")
+    sanic_jwt = Initialize(
+        sanic_app,
+        authenticate=authenticate,
+        responses_class=MyResponses,
+        verify_batch_enabled=True,
+    )
+    access_token = get_access_token(sanic_app, sanic_jwt)
+
+    _, response = sanic_app.test_client.get(
+        "/auth/verify",
+        headers={"Authorization": "Bearer {}".format(access_token)},
+    )
+    assert response.json.get("service") == "tokens"
+
+    _, response = sanic_app.test_client.post(
+        "/auth/verify", json=[access_token, "abc"]
+    )
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line.get("service") for line in lines] == ["tokens", "tokens"]
+
+
+def test_verify_endpoint_batch_invalid_request(app_with_verify_batch):
+    sanic_app, sanic_jwt = app_with_verify_batch
+
+    _, response = sanic_app.test_client.post(
+        "/auth/verify", json={"tokens": []}
+    )
+
+    assert response.status == 400
+    assert response.json.get("exception") == "InvalidVerifyRequest"
+
+    sanic_jwt.config.verify_batch_limit.update(1)
+    _, response = sanic_app.test_client.post(
+        "/auth/verify", json=["abc", "def"]
+    )
+
+    assert response.status == 400
+    assert response.json.get("exception") == "InvalidVerifyRequest"
+
+
+def test_verify_endpoint_batch_error(authenticate, get_access_token):
+    class BogusClaim(Claim):
+        key = "bogus"
+
+        def setup(self, payload, user):
+            return "bogus"
+
+        def verify(self, value):
+            return "not a boolean"
+
+    sanic_app = Sanic("sanic-jwt-test")
+    sanic_jwt = Initialize(
+        sanic_app,
+        authenticate=authenticate,
+        custom_claims=[BogusClaim],
+        verify_batch_enabled=True,
+    )
+    access_token = get_access_token(sanic_app, sanic_jwt)
+
+    _, response = sanic_app.test_client.post(
+        "/auth/verify", json=["abc"] * 150 + [access_token]
+    )
+
+    # Not a successful response cut short
+    assert response.status == 500
+    assert response.json.get("exception") == "InvalidCustomClaim"
+
+
+def test_verify_endpoint_batch_user_secret_error(authenticate):
+    async def retrieve_user_secret(user_id, **kwargs):
+        raise exceptions.AuthenticationFailed("Secrets are unavailable.")
+
+    sanic_app = Sanic("sanic-jwt-test")
+    Initialize(
+        sanic_app,
+        authenticate=authenticate,
+        user_secret_enabled=True,
+        retrieve_user_secret=retrieve_user_secret,
+        verify_batch_enabled=True,
+    )
+    access_token = jwt.encode({"user_id": 1}, "secret")
+
+    _, response = sanic_app.test_client.post(
+        "/auth/verify", json=["abc"] * 150 + [access_token]
+    )
+
+    assert response.status == 401
+    assert response.json.get("exception") == "AuthenticationFailed"